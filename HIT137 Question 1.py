@@ -4,6 +4,131 @@
 # In[3]:
 
 
+import argparse
+import mmap
+import os
+from functools import lru_cache
+from multiprocessing import Pool
+
+DEFAULT_INPUT_FILENAME = "raw_text.txt"
+DEFAULT_OUTPUT_FILENAME = "encrypted_text.txt"
+CHUNK_SIZE = 1024 * 1024  # Number of bytes processed at a time when streaming files
+REGION_SIZE = 16 * 1024 * 1024  # Number of bytes handed to each worker in parallel mode
+TABLE_CACHE_SIZE = 256  # Number of key schedules whose translation tables are kept
+
+def key_schedule(key_n, key_m):
+    """
+    Reduces a key pair to the four alphabet shifts the cipher actually uses.
+
+    Every shift is taken modulo 26, so many different key pairs (for example
+    any keys that differ by a multiple of 26) share the same schedule and
+    therefore the same translation tables.
+
+    Args:
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+
+    Returns:
+        tuple: The shifts for 'a'-'m', 'n'-'z', 'A'-'M' and 'N'-'Z', each in 0-25.
+    """
+    return ((key_n * key_m) % 26,  # Forward shift for the first half of lowercase letters
+            (key_n + key_m) % 26,  # Backward shift for the second half of lowercase letters
+            key_n % 26,  # Backward shift for the first half of uppercase letters
+            key_m**2 % 26)  # Forward shift for the second half of uppercase letters
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _tables_for_schedule(schedule):
+    """
+    Builds the `str.translate` tables for a key schedule, keeping the most
+    recently used ones in a bounded LRU cache.
+    """
+    lower_forward, lower_backward, upper_backward, upper_forward = schedule
+
+    encode_map = {}
+    decode_map = {}
+    for offset in range(26):
+        lower_symbol = ord('a') + offset
+        upper_symbol = ord('A') + offset
+        if offset < 13:
+            # Letters 'a'-'m' and 'A'-'M'
+            encode_map[lower_symbol] = chr((offset + lower_forward) % 26 + ord('a'))
+            decode_map[lower_symbol] = chr((offset - lower_forward) % 26 + ord('a'))
+            encode_map[upper_symbol] = chr((offset - upper_backward) % 26 + ord('A'))
+            decode_map[upper_symbol] = chr((offset + upper_backward) % 26 + ord('A'))
+        else:
+            # Letters 'n'-'z' and 'N'-'Z'
+            encode_map[lower_symbol] = chr((offset - lower_backward) % 26 + ord('a'))
+            decode_map[lower_symbol] = chr((offset + lower_backward) % 26 + ord('a'))
+            encode_map[upper_symbol] = chr((offset + upper_forward) % 26 + ord('A'))
+            decode_map[upper_symbol] = chr((offset - upper_forward) % 26 + ord('A'))
+    return str.maketrans(encode_map), str.maketrans(decode_map)
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _byte_tables_for_schedule(schedule):
+    """
+    Builds the `bytes.translate` tables for a key schedule, keeping the most
+    recently used ones in a bounded LRU cache.
+    """
+    encode_table, decode_table = _tables_for_schedule(schedule)
+    every_byte = bytes(range(256)).decode("latin-1")
+    return (every_byte.translate(encode_table).encode("latin-1"),
+            every_byte.translate(decode_table).encode("latin-1"))
+
+def build_translation_tables(key_n, key_m):
+    """
+    Precomputes the substitution tables used to encode and decode text.
+
+    Every letter is shifted by an amount that depends only on its case, on
+    which half of the alphabet it falls in and on the two keys, so the whole
+    cipher can be expressed as a fixed 52-letter substitution. Building it
+    once lets each message be transformed in a single `str.translate` pass.
+    Tables are cached by key schedule, so repeated calls with the same (or an
+    equivalent) key pair cost only the schedule arithmetic and a lookup.
+
+    Args:
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+
+    Returns:
+        tuple: A pair `(encode_table, decode_table)` suitable for `str.translate`.
+               The tables are shared between callers and must not be modified.
+    """
+    return _tables_for_schedule(key_schedule(key_n, key_m))
+
+def build_byte_tables(key_n, key_m):
+    """
+    Precomputes 256-entry byte tables equivalent to `build_translation_tables`.
+
+    Only ASCII letters are substituted, and in UTF-8 (or any other ASCII
+    compatible encoding) those bytes never occur inside a multi-byte
+    character, so translating the raw bytes of a file gives the same result
+    as decoding it, translating the text and encoding it again.
+
+    Args:
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+
+    Returns:
+        tuple: A pair `(encode_table, decode_table)` suitable for `bytes.translate`.
+    """
+    return _byte_tables_for_schedule(key_schedule(key_n, key_m))
+
+def table_cache_info():
+    """
+    Reports how well the translation table cache is working.
+
+    Returns:
+        dict: Hit, miss and size counters for the text and byte table caches,
+              as `{"text": CacheInfo, "bytes": CacheInfo}`.
+    """
+    return {"text": _tables_for_schedule.cache_info(),
+            "bytes": _byte_tables_for_schedule.cache_info()}
+
+def clear_table_cache():
+    """Empties the translation table caches and resets their counters."""
+    _byte_tables_for_schedule.cache_clear()
+    _tables_for_schedule.cache_clear()
+
 def scramble_text(plain_text, key_n, key_m):
     """
     Transforms the input text into an encoded format based on two secret keys.
@@ -20,30 +145,9 @@ def scramble_text(plain_text, key_n, key_m):
     Returns:
         str: The encoded text.
     """
-    cipher_text = ""
-    for symbol in plain_text:
-        if 'a' <= symbol <= 'z':
-            if symbol <= 'm':
-                # Shift forward for first half of lowercase letters
-                shifted_val = (ord(symbol) - ord('a') + key_n * key_m) % 26
-                cipher_text += chr(shifted_val + ord('a'))
-            else:
-                # Shift backward for second half of lowercase letters
-                shifted_val = (ord(symbol) - ord('a') - (key_n + key_m)) % 26
-                cipher_text += chr(shifted_val + ord('a'))
-        elif 'A' <= symbol <= 'Z':
-            if symbol <= 'M':
-                # Shift backward for first half of uppercase letters
-                shifted_val = (ord(symbol) - ord('A') - key_n) % 26
-                cipher_text += chr(shifted_val + ord('A'))
-            else:
-                # Shift forward for second half of uppercase letters
-                shifted_val = (ord(symbol) - ord('A') + key_m**2) % 26
-                cipher_text += chr(shifted_val + ord('A'))
-        else:
-            # Keep non-alphabetic characters unchanged
-            cipher_text += symbol
-    return cipher_text
+    encode_table, _ = build_translation_tables(key_n, key_m)
+    # Non-alphabetic characters are absent from the table and stay unchanged
+    return plain_text.translate(encode_table)
 
 def un_scramble_text(encoded_text, key_n, key_m):
     """
@@ -60,30 +164,9 @@ def un_scramble_text(encoded_text, key_n, key_m):
     Returns:
         str: The original, decoded text.
     """
-    original_text = ""
-    for symbol in encoded_text:
-        if 'a' <= symbol <= 'z':
-            if symbol <= 'm':
-                # Reverse shift for first half of lowercase letters
-                shifted_val = (ord(symbol) - ord('a') - key_n * key_m) % 26
-                original_text += chr(shifted_val + ord('a'))
-            else:
-                # Reverse shift for second half of lowercase letters
-                shifted_val = (ord(symbol) - ord('a') + (key_n + key_m)) % 26
-                original_text += chr(shifted_val + ord('a'))
-        elif 'A' <= symbol <= 'Z':
-            if symbol <= 'M':
-                # Reverse shift for first half of uppercase letters
-                shifted_val = (ord(symbol) - ord('A') + key_n) % 26
-                original_text += chr(shifted_val + ord('A'))
-            else:
-                # Reverse shift for second half of uppercase letters
-                shifted_val = (ord(symbol) - ord('A') - key_m**2) % 26
-                original_text += chr(shifted_val + ord('A'))
-        else:
-            # Keep non-alphabetic characters unchanged
-            original_text += symbol
-    return original_text
+    _, decode_table = build_translation_tables(key_n, key_m)
+    # Non-alphabetic characters are absent from the table and stay unchanged
+    return encoded_text.translate(decode_table)
 
 def verify_integrity(original, recovered):
     """
@@ -98,43 +181,352 @@ def verify_integrity(original, recovered):
     """
     return original == recovered
 
-def text_handling_process():
+def _translate_buffer(data, byte_table):
+    """
+    Translates any bytes-like object, returning a new `bytes` or `bytearray`.
+
+    `bytes` and `bytearray` are translated directly. Other buffers, such as
+    memoryviews, are translated in `CHUNK_SIZE` pieces so that only the
+    result needs a full-sized allocation.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data.translate(byte_table)
+    with memoryview(data) as view, view.cast("B") as flat:
+        return b"".join(flat[start:start + CHUNK_SIZE].tobytes().translate(byte_table)
+                        for start in range(0, flat.nbytes, CHUNK_SIZE))
+
+def _translate_in_place(buffer, byte_table):
+    """
+    Overwrites a writable buffer with its translation, one `CHUNK_SIZE` piece
+    at a time, so the extra memory used is bounded by the chunk size.
+    """
+    with memoryview(buffer) as view:
+        if view.readonly:
+            raise TypeError(f"cannot transform a read-only {type(buffer).__name__} in place")
+        with view.cast("B") as flat:
+            for start in range(0, flat.nbytes, CHUNK_SIZE):
+                piece = flat[start:start + CHUNK_SIZE]
+                piece[:] = piece.tobytes().translate(byte_table)
+
+def scramble_bytes(plain_data, key_n, key_m, in_place=False):
+    """
+    Encodes ASCII or UTF-8 bytes with the same rules as `scramble_text`.
+
+    Only the bytes of ASCII letters are changed; every other byte, including
+    the bytes of multi-byte UTF-8 characters, is left as it is. The result is
+    therefore the encoded form of `scramble_text(plain_data.decode(), ...)`
+    without decoding or re-encoding the data.
+
+    Args:
+        plain_data (bytes-like): The data to encode, e.g. `bytes`, `bytearray`
+                                 or `memoryview`.
+        key_n (int): The first secret integer key influencing the encoding.
+        key_m (int): The second secret integer key affecting the encoding process.
+        in_place (bool): Whether to overwrite `plain_data`, which must then be
+                         a writable buffer, instead of returning a copy.
+
+    Returns:
+        bytes: The encoded data (a `bytearray` for `bytearray` input), or None
+               when transforming in place.
+    """
+    encode_table, _ = build_byte_tables(key_n, key_m)
+    if in_place:
+        _translate_in_place(plain_data, encode_table)
+        return None
+    return _translate_buffer(plain_data, encode_table)
+
+def un_scramble_bytes(encoded_data, key_n, key_m, in_place=False):
+    """
+    Decodes bytes produced by `scramble_bytes`, with the same rules as
+    `un_scramble_text`.
+
+    Args:
+        encoded_data (bytes-like): The data to decode, e.g. `bytes`, `bytearray`
+                                   or `memoryview`.
+        key_n (int): The first secret integer key used for decoding.
+        key_m (int): The second secret integer key used for decoding.
+        in_place (bool): Whether to overwrite `encoded_data`, which must then
+                         be a writable buffer, instead of returning a copy.
+
+    Returns:
+        bytes: The decoded data (a `bytearray` for `bytearray` input), or None
+               when transforming in place.
+    """
+    _, decode_table = build_byte_tables(key_n, key_m)
+    if in_place:
+        _translate_in_place(encoded_data, decode_table)
+        return None
+    return _translate_buffer(encoded_data, decode_table)
+
+def verify_bytes_integrity(original_data, encoded_data, key_n, key_m):
+    """
+    Checks that encoded bytes decode back to the original without building a
+    decoded copy of the whole message.
+
+    The encoded data is decoded and compared one `CHUNK_SIZE` piece at a
+    time, so only a single chunk of scratch memory is allocated.
+
+    Args:
+        original_data (bytes-like): The data before encoding.
+        encoded_data (bytes-like): The data produced by `scramble_bytes`.
+        key_n (int): The first secret integer key used for decoding.
+        key_m (int): The second secret integer key used for decoding.
+
+    Returns:
+        bool: True if the decoded data is an exact match, False otherwise.
+    """
+    _, decode_table = build_byte_tables(key_n, key_m)
+    with memoryview(original_data) as original_view, memoryview(encoded_data) as encoded_view, \
+            original_view.cast("B") as original, encoded_view.cast("B") as encoded:
+        if original.nbytes != encoded.nbytes:
+            return False
+        for start in range(0, original.nbytes, CHUNK_SIZE):
+            recovered = encoded[start:start + CHUNK_SIZE].tobytes().translate(decode_table)
+            if original[start:start + CHUNK_SIZE] != recovered:
+                return False
+    return True
+
+def read_chunks(text_file, chunk_size=CHUNK_SIZE):
+    """
+    Yields successive fixed-size chunks of an open file.
+
+    Args:
+        text_file (file): A file object, opened in binary or text mode.
+        chunk_size (int): The maximum number of bytes (or characters) per chunk.
+
+    Yields:
+        bytes: The next chunk, or str in text mode, until the end of the file is reached.
+    """
+    while True:
+        chunk = text_file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def scramble_file(input_filename, output_filename, key_n, key_m, chunk_size=CHUNK_SIZE):
+    """
+    Encodes a text file chunk by chunk and writes the result incrementally.
+
+    Only one chunk is held in memory at a time, so the memory used does not
+    depend on the size of the input file. The file is read as raw bytes (see
+    `build_byte_tables`), so line endings are kept exactly as they are and
+    the output matches `scramble_files_parallel` byte for byte.
+
+    Args:
+        input_filename (str): The path of the plain text file.
+        output_filename (str): The path the encoded text is written to.
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+        chunk_size (int): The number of bytes encoded per chunk.
+    """
+    encode_table, _ = build_byte_tables(key_n, key_m)
+    with open(input_filename, "rb") as source_file, open(output_filename, "wb") as destination_file:
+        for chunk in read_chunks(source_file, chunk_size):
+            destination_file.write(chunk.translate(encode_table))
+
+def verify_file_integrity(original_filename, encoded_filename, key_n, key_m, chunk_size=CHUNK_SIZE):
+    """
+    Decodes an encoded file chunk by chunk and compares it with the original.
+
+    The cipher maps every byte to exactly one byte, so equal-sized chunks of
+    both files line up and can be checked one pair at a time instead of
+    comparing two whole copies of the text. Files are compared as raw bytes,
+    so files that are not valid text can be checked too.
+
+    Args:
+        original_filename (str): The path of the plain text file.
+        encoded_filename (str): The path of the encoded text file.
+        key_n (int): The first secret integer key used for decoding.
+        key_m (int): The second secret integer key used for decoding.
+        chunk_size (int): The number of bytes compared per chunk.
+
+    Returns:
+        bool: True if the decoded file matches the original exactly, False otherwise.
+    """
+    _, decode_table = build_byte_tables(key_n, key_m)
+    with open(original_filename, "rb") as original_file, open(encoded_filename, "rb") as encoded_file:
+        while True:
+            original_chunk = original_file.read(chunk_size)
+            recovered_chunk = encoded_file.read(chunk_size).translate(decode_table)
+            if not verify_integrity(original_chunk, recovered_chunk):
+                return False
+            if not original_chunk:
+                # Both files ended at the same point
+                return True
+
+def _scramble_region(task):
+    """
+    Encodes one byte range of a file straight into the same range of the output.
+
+    This is the unit of work for the process pool. Both files are memory
+    mapped, so a worker only touches the pages of its own region.
+
+    Args:
+        task (tuple): `(input_filename, output_filename, start, stop, byte_table)`.
+
+    Returns:
+        int: The number of bytes encoded.
+    """
+    input_filename, output_filename, start, stop, byte_table = task
+    with open(input_filename, "rb") as source_file, open(output_filename, "r+b") as destination_file:
+        with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as source, \
+                mmap.mmap(destination_file.fileno(), 0) as destination:
+            for offset in range(start, stop, CHUNK_SIZE):
+                end = min(offset + CHUNK_SIZE, stop)
+                destination[offset:end] = source[offset:end].translate(byte_table)
+    return stop - start
+
+def scramble_files_parallel(file_pairs, key_n, key_m, workers=None, region_size=REGION_SIZE):
+    """
+    Encodes a set of files using a pool of worker processes.
+
+    Every output file is created at its final size up front, then each input
+    is cut into byte regions that the workers encode independently and write
+    directly into place. Because every byte is encoded on its own, the result
+    is identical to encoding the files one after another with `scramble_file`,
+    line endings included.
+
+    Args:
+        file_pairs (list): `(input_filename, output_filename)` pairs.
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+        workers (int): The number of processes, defaulting to the CPU count.
+                       With a single worker everything runs in this process.
+        region_size (int): The number of bytes in each unit of work.
+
+    Returns:
+        int: The total number of bytes encoded.
+    """
+    encode_table, _ = build_byte_tables(key_n, key_m)
+    tasks = []
+    for input_filename, output_filename in file_pairs:
+        file_size = os.path.getsize(input_filename)
+        with open(output_filename, "wb") as destination_file:
+            destination_file.truncate(file_size)
+        # Empty files cannot be memory mapped, and have nothing to encode anyway
+        for start in range(0, file_size, region_size):
+            tasks.append((input_filename, output_filename, start,
+                          min(start + region_size, file_size), encode_table))
+
+    if workers == 1:
+        return sum(map(_scramble_region, tasks))
+    with Pool(workers) as pool:
+        return sum(pool.imap_unordered(_scramble_region, tasks))
+
+def scramble_directory(input_directory, output_directory, key_n, key_m, workers=None):
+    """
+    Encodes every file in a directory into a second directory of the same names.
+
+    Args:
+        input_directory (str): The directory holding the plain text files.
+        output_directory (str): The directory the encoded files are written to.
+        key_n (int): The first secret integer key.
+        key_m (int): The second secret integer key.
+        workers (int): The number of processes, defaulting to the CPU count.
+
+    Returns:
+        list: The `(input_filename, output_filename)` pairs that were encoded.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    file_pairs = [(os.path.join(input_directory, filename), os.path.join(output_directory, filename))
+                  for filename in sorted(os.listdir(input_directory))
+                  if os.path.isfile(os.path.join(input_directory, filename))]
+    scramble_files_parallel(file_pairs, key_n, key_m, workers)
+    return file_pairs
+
+def parse_arguments(argv=None):
+    """
+    Reads the keys, file paths and chunk size from the command line.
+
+    Args:
+        argv (list): The arguments to parse, defaulting to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: The parsed options. Keys left out are None and
+                            are asked for interactively.
+    """
+    parser = argparse.ArgumentParser(
+        description="Encode a text file with the two-key cipher and verify that it decodes back.")
+    parser.add_argument("-n", "--key-n", type=int,
+                        help="first encoding key (prompted for if omitted)")
+    parser.add_argument("-m", "--key-m", type=int,
+                        help="second encoding key (prompted for if omitted)")
+    parser.add_argument("-i", "--input", default=DEFAULT_INPUT_FILENAME,
+                        help=f"plain text file to encode (default: {DEFAULT_INPUT_FILENAME})")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILENAME,
+                        help=f"file the encoded text is written to (default: {DEFAULT_OUTPUT_FILENAME})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"bytes processed per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="encode with this many processes; a directory input always uses "
+                             "the process pool (default: one per CPU)")
+    options = parser.parse_args(argv)
+    if options.chunk_size < 1:
+        parser.error("argument --chunk-size: must be at least 1")
+    if options.workers is not None and options.workers < 1:
+        parser.error("argument -w/--workers: must be at least 1")
+    return options
+
+def text_handling_process(argv=None):
     """
     Orchestrates the reading of a file, encoding its content, saving the
     encoded text, decoding it, and verifying the process.
+
+    The file is streamed in chunks, so memory use stays constant however
+    large it is. With `--workers`, or when the input is a directory, the
+    work is spread over a process pool instead. Keys can be passed on the
+    command line for batch jobs; any key that is missing is asked for
+    interactively.
+
+    Args:
+        argv (list): Command-line arguments, defaulting to `sys.argv[1:]`.
+
+    Returns:
+        bool: True if the encoded file decodes back to the original, False otherwise.
     """
-    input_filename = "raw_text.txt"
-    output_filename = "encrypted_text.txt"
+    options = parse_arguments(argv)
+    input_filename = options.input
+    output_filename = options.output
 
-    try:
-        with open(input_filename, "r") as source_file:
-            plain_content = source_file.read()
-    except FileNotFoundError:
+    if not os.path.exists(input_filename):
         print(f"Error: The file '{input_filename}' was not found.")
-        return
-
-    first_key = int(input("Enter the first encoding key (an integer): "))
-    second_key = int(input("Enter the second encoding key (an integer): "))
+        return False
+    # Writing over the input while it is being read would destroy it.
+    if os.path.exists(output_filename) and os.path.samefile(input_filename, output_filename):
+        print(f"Error: The output '{output_filename}' is the same as the input.")
+        return False
 
-    encoded_content = scramble_text(plain_content, first_key, second_key)
+    first_key = options.key_n
+    if first_key is None:
+        first_key = int(input("Enter the first encoding key (an integer): "))
+    second_key = options.key_m
+    if second_key is None:
+        second_key = int(input("Enter the second encoding key (an integer): "))
 
     try:
-        with open(output_filename, "w") as destination_file:
-            destination_file.write(encoded_content)
+        if os.path.isdir(input_filename):
+            file_pairs = scramble_directory(input_filename, output_filename, first_key, second_key,
+                                            options.workers)
+        elif options.workers is not None:
+            file_pairs = [(input_filename, output_filename)]
+            scramble_files_parallel(file_pairs, first_key, second_key, options.workers)
+        else:
+            file_pairs = [(input_filename, output_filename)]
+            scramble_file(input_filename, output_filename, first_key, second_key, options.chunk_size)
         print(f"Encoding complete. Encoded text saved to '{output_filename}'.")
     except Exception as e:
         print(f"Error writing to '{output_filename}': {e}")
-        return
-
-    decoded_content = un_scramble_text(encoded_content, first_key, second_key)
+        return False
 
-    if verify_integrity(plain_content, decoded_content):
+    if all(verify_file_integrity(original, encoded, first_key, second_key, options.chunk_size)
+           for original, encoded in file_pairs):
         print("Decoding successful! The recovered text matches the original.")
-    else:
-        print("Decoding verification failed. The recovered text is different from the original.")
+        return True
+    print("Decoding verification failed. The recovered text is different from the original.")
+    return False
 
 if __name__ == "__main__":
-    text_handling_process()
+    raise SystemExit(0 if text_handling_process() else 1)
 
 
 # In[ ]:
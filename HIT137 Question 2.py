@@ -5,12 +5,43 @@
 
 
 import os
+import io
+import re
 import csv
-from collections import defaultdict
+import json
+import math
+import time
+import sqlite3
+import tracemalloc
+import argparse
+from contextlib import closing, contextmanager, nullcontext
+from multiprocessing import Pool
+from operator import itemgetter
+
+import numpy as np
 
 # Configuration: Define the directory where the temperature data files are located.
 DATA_DIRECTORY = 'temperature_data'
 
+# The sidecar file that caches the summary of each CSV file between runs.
+CACHE_FILENAME = 'temperature_summary_cache.sqlite'
+
+# The directory holding the binary copy of the archive written by `convert_to_store`.
+STORE_DIRECTORY = 'temperature_store'
+
+# The width and height, in degrees, of the latitude/longitude cells used to index stations.
+GRID_SIZE = 1.0
+
+# Station statistics closer than this (in degrees Celsius) to the warmest, coolest or
+# largest range are reported as ties, so adding the same readings up in a different
+# order (as the loading modes do) cannot split them. It only covers summation
+# rounding: readings must reach the statistics exactly as parsed, which is why the
+# binary store restores its float32 readings to the source's decimals.
+EXTREME_TOLERANCE = 1e-9
+
+# The JSON file, written next to the reports, that records the stage timings of a --profile run.
+PROFILE_FILENAME = 'pipeline_profile.json'
+
 # Define a list of month names, which correspond to the column headers in the CSV files.
 MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
                "July", "August", "September", "October", "November", "December"]
@@ -23,186 +54,1462 @@ SEASONS = {
     'Spring': ['September', 'October', 'November']
 }
 
-def load_temperature_data(data_directory):
+def find_data_files(data_directory):
     """
-    This function reads temperature data from all CSV files found within the
-    specified directory. Each CSV file is assumed to contain temperature readings
-    for different months of a single year, along with a 'STATION_NAME' column.
+    Lists the CSV files in the data directory in file name order.
 
-    The function returns a dictionary where the keys are the names of the weather
-    stations, and the values are lists of lists. Each inner list represents the
-    monthly temperatures recorded for that station in a particular year.
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+
+    Returns:
+        list: The full paths of the CSV files.
+    """
+    filepaths = []
+    for filename in sorted(os.listdir(data_directory)):
+        filepath = os.path.join(data_directory, filename)
+        # Check if the current item is a file and if its name ends with '.csv'.
+        if os.path.isfile(filepath) and filename.endswith('.csv'):
+            filepaths.append(filepath)
+    return filepaths
+
+@contextmanager
+def reporting_load_errors(data_directory):
+    """
+    Prints, rather than raises, an error that stops the archive from loading,
+    so that the loaders return whatever they had read before it.
+
+    Args:
+        data_directory (str): The directory being loaded, named in the message.
     """
-    all_data = defaultdict(list) # Use defaultdict to automatically create a list for new stations
     try:
-        # Iterate through all files and directories within the specified data directory.
-        for filename in os.listdir(data_directory):
-            # Check if the current item is a file and if its name ends with '.csv'.
-            if os.path.isfile(os.path.join(data_directory, filename)) and filename.endswith('.csv'):
-                filepath = os.path.join(data_directory, filename)
-                # Open each CSV file for reading. 'newline=''' ensures proper handling of line endings.
-                with open(filepath, 'r', newline='') as csvfile:
-                    # Create a CSV DictReader object to read the CSV file as dictionaries.
-                    reader = csv.DictReader(csvfile)
-                    # Check if the expected 'STATION_NAME' and the first month's header exist.
-                    if MONTH_NAMES[0] not in reader.fieldnames or 'STATION_NAME' not in reader.fieldnames:
-                        print(f"Warning: CSV file {filename} does not contain expected headers. Skipping.")
-                        continue # Skip to the next file if headers are missing.
-                    # Iterate over each row in the CSV file. Each row is a dictionary.
-                    for row in reader:
-                        station_name = row['STATION_NAME'] # Extract the station name from the row.
-                        # Extract the monthly temperatures. Convert to float if a value exists, otherwise None.
-                        monthly_temps = [float(row[month]) if row[month] else None for month in MONTH_NAMES]
-                        all_data[station_name].append(monthly_temps) # Append the monthly data to the station's list.
+        yield
     except FileNotFoundError:
         print(f"Error: Directory not found: {data_directory}")
     except Exception as e:
         print(f"An error occurred during data loading: {e}")
-    return all_data # Return the dictionary containing temperature data for all stations.
-
-# Load the temperature data by calling the load_temperature_data function.
-station_temperatures = load_temperature_data(DATA_DIRECTORY)
-
-# 1. Calculate the average temperature for each month across all years and stations.
-monthly_average_temperatures = [[] for _ in MONTH_NAMES] # Initialize a list of empty lists for each month.
-# Iterate through the temperature data for each station.
-for station_data in station_temperatures.values():
-    # Iterate through the yearly temperature data for the current station.
-    for year_data in station_data:
-        # Iterate through the temperatures for each month in the current year.
-        for i, temp in enumerate(year_data):
-            # Check if the temperature reading is not None before appending.
+
+def read_header(header, filepath, extra_columns=()):
+    """
+    Checks the header of a CSV file and finds the columns of interest in it.
+
+    As with `csv.DictReader`, the last of two columns with the same name wins.
+    A column missing from the header is given the position just past the end
+    of the row, where readers find an empty cell.
+
+    Args:
+        header (list): The fields of the first line of the file.
+        filepath (str): The path of the file, named in the warning if it is skipped.
+        extra_columns (tuple): Names of other columns to find, such as 'STN_ID'.
+
+    Returns:
+        tuple: `(width, name_column, month_columns, extra_columns)` as positions in
+               a row, or None, after printing a warning, if the file does not
+               contain the expected headers.
+    """
+    # Check if the expected 'STATION_NAME' and the first month's header exist.
+    if MONTH_NAMES[0] not in header or 'STATION_NAME' not in header:
+        print(f"Warning: CSV file {os.path.basename(filepath)} does not contain expected headers. Skipping.")
+        return None
+    # Map each column name to its position; as with DictReader, the last duplicate wins.
+    columns = {name: position for position, name in enumerate(header)}
+    width = len(header)
+    return (width, columns['STATION_NAME'], [columns.get(month, width) for month in MONTH_NAMES],
+            [columns.get(column, width) for column in extra_columns])
+
+def station_rows(rows, filepath, extra_columns=()):
+    """
+    Picks the station name, monthly cells and other columns out of the rows of a CSV file.
+
+    Both the bulk and the streaming readers go through here (or, for regular
+    files, through `read_header` and `parse_plain_columns`), so they treat
+    headers, blank lines and short rows the same way. As with `csv.DictReader`,
+    blank lines are skipped, and cells missing from short rows (or whole
+    columns missing from the header) are read as empty strings.
+
+    Args:
+        rows (iterator): The fields of every line of the file, header first.
+        filepath (str): The path of the file, named in the warning if it is skipped.
+        extra_columns (tuple): Names of other columns to pick, such as 'STN_ID'.
+
+    Returns:
+        iterator: `(station_name, month_cells, extra_cells)` for every row, or None,
+                  after printing a warning, if the file does not contain the expected headers.
+    """
+    layout = read_header(next(rows, []), filepath, extra_columns)
+    if layout is None:
+        return None
+    width, name_column, month_columns, extra_positions = layout
+    padding = [''] * (width + 1)
+    # Months without a column read from the padding cell past the end of every row.
+    get_months = itemgetter(*month_columns)
+
+    def cells():
+        for fields in rows:
+            if not fields or fields == ['']:
+                continue # Skip blank lines, as DictReader does.
+            if len(fields) <= width:
+                fields += padding[len(fields):]
+            yield fields[name_column], get_months(fields), [fields[position] for position in extra_positions]
+    return cells()
+
+def parse_plain_columns(lines, layout):
+    """
+    Reads the columns of unquoted CSV lines in bulk, without splitting every row in Python.
+
+    The readings are parsed by `np.loadtxt` straight into a float array. It
+    cannot read empty cells, so every line is first framed with commas, which
+    makes each empty cell a ',,' that is filled with 'nan' by two passes of
+    `str.replace`. The station names and other columns are cut from the front
+    of each line with a bounded `str.split`.
+
+    Args:
+        lines (list): The lines of the file after the header.
+        layout (tuple): The column positions found by `read_header`.
+
+    Returns:
+        tuple: `(station_names, values, extra_cells)`, or None if the lines are not
+               regular enough to read this way (blank lines, short rows, missing
+               month columns or cells `np.loadtxt` rejects), in which case they
+               should be read row by row with `station_rows`.
+    """
+    width, name_column, month_columns, extra_positions = layout
+    if not lines:
+        return [], np.empty((0, len(MONTH_NAMES))), [[] for _ in extra_positions]
+    if max(month_columns) >= width:
+        return None
+
+    def column(position):
+        if position >= width:
+            return [''] * len(lines) # The header lacks this column.
+        return [line.split(',', position + 1)[position] for line in lines]
+
+    try:
+        station_names = column(name_column)
+        extra_cells = [column(position) for position in extra_positions]
+        framed = (',' + ',\n,'.join(lines) + ',').replace(',,', ',nan,').replace(',,', ',nan,')
+        # The leading comma of every framed line shifts its columns along by one.
+        values = np.loadtxt(io.StringIO(framed), delimiter=',', comments=None, ndmin=2,
+                            usecols=[position + 1 for position in month_columns])
+    except (IndexError, ValueError):
+        return None
+    return station_names, values, extra_cells
+
+def parse_temperature_file(filepath, extra_columns=()):
+    """
+    Reads the station names and monthly temperatures from one CSV file in bulk.
+
+    The whole file is read at once. Regular, unquoted files are parsed column
+    by column with `parse_plain_columns`, which is much faster than building
+    a dictionary per row with `csv.DictReader`. Anything else is split row by
+    row: on commas, or with the `csv` module when the file uses quoted fields
+    so that commas inside quotes are still handled correctly. Empty cells, and
+    cells missing from short rows, are treated as missing readings.
+
+    Args:
+        filepath (str): The path of a `stations_group_*.csv` file.
+        extra_columns (tuple): Names of other columns to return, such as 'STN_ID'.
+
+    Returns:
+        tuple: `(station_names, values, extras)` where `values` is a float array of
+               shape `(rows, 12)` with NaN for missing readings and `extras` maps
+               each extra column to its cells (empty strings when the file lacks
+               that column), or None, after printing a warning, if the file does
+               not contain the expected headers.
+    """
+    # Open the CSV file for reading. 'newline=''' ensures proper handling of line endings.
+    with open(filepath, 'r', newline='') as csvfile:
+        text = csvfile.read()
+    if '"' in text:
+        lines = csv.reader(io.StringIO(text)) # Quoted fields need the full CSV rules.
+    else:
+        text_lines = text.splitlines()
+        layout = read_header(text_lines[0].split(',') if text_lines else [], filepath, extra_columns)
+        if layout is None:
+            return None
+        parsed = parse_plain_columns(text_lines[1:], layout)
+        if parsed is not None:
+            station_names, values, extra_cells = parsed
+            return station_names, values, dict(zip(extra_columns, extra_cells))
+        lines = (line.split(',') for line in text_lines)
+    rows = station_rows(lines, filepath, extra_columns)
+    if rows is None:
+        return None
+
+    station_names = []
+    cells = []
+    extra_cells = [[] for _ in extra_columns]
+    for station_name, month_cells, row_extras in rows:
+        station_names.append(station_name)
+        cells.extend(month_cells)
+        for column_cells, cell in zip(extra_cells, row_extras):
+            column_cells.append(cell)
+
+    # Convert each month to float if a value exists, otherwise NaN, straight into a typed array.
+    values = np.fromiter((float(cell) if cell else np.nan for cell in cells), dtype=float, count=len(cells))
+    return station_names, values.reshape(-1, len(MONTH_NAMES)), dict(zip(extra_columns, extra_cells))
+
+def row_repeats(stations):
+    """
+    Numbers the rows of each station within one file.
+
+    Args:
+        stations (ndarray): The station position of every row of the file.
+
+    Returns:
+        ndarray: 0 for the first row of each station, 1 for its second row, and so on.
+    """
+    order = np.argsort(stations, kind='stable')
+    ordered = stations[order]
+    # Find where each station's run of rows starts in the sorted order.
+    run_starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    run_lengths = np.diff(np.r_[run_starts, len(ordered)])
+    repeats = np.empty(len(stations), dtype=np.intp)
+    repeats[order] = np.arange(len(ordered)) - np.repeat(run_starts, run_lengths)
+    return repeats
+
+def load_temperature_data(data_directory, filepaths=None):
+    """
+    This function reads temperature data from all CSV files found within the
+    specified directory. Each CSV file is assumed to contain temperature readings
+    for different months of a single year, along with a 'STATION_NAME' column.
+
+    The data is returned as a dense array with one slice per file (in file name
+    order), one row per station and one column per month. Missing readings,
+    including stations that do not appear in a file, are stored as NaN. If a
+    station appears more than once in the same file, each repeated row goes
+    into an extra slice after the file's own, so that every row counts as one
+    year of readings, as in the other loading modes.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Returns:
+        tuple: `(station_names, temperatures)` where `station_names` lists the
+               stations in order of first appearance and `temperatures` is a
+               float array of shape `(slices, stations, 12)`, with one slice per
+               file plus one per repeated station row.
+    """
+    station_index = {} # Map each station name to its row in the array.
+    file_values = [] # For every file, the station rows and the monthly temperatures read from it.
+    with reporting_load_errors(data_directory):
+        if filepaths is None:
+            filepaths = find_data_files(data_directory)
+        # Iterate through all CSV files within the specified data directory, in a stable order.
+        for filepath in filepaths:
+            parsed = parse_temperature_file(filepath)
+            if parsed is None:
+                continue # Skip to the next file if headers are missing.
+            names, values, _ = parsed
+            stations = np.fromiter((station_index.setdefault(name, len(station_index)) for name in names),
+                                   dtype=np.intp, count=len(names))
+            file_values.append((stations, row_repeats(stations), values))
+
+    # Copy each file into a preallocated array, leaving NaN wherever no reading exists.
+    slice_counts = [max(1, int(repeats.max(initial=0)) + 1) for _, repeats, _ in file_values]
+    temperatures = np.full((sum(slice_counts), len(station_index), len(MONTH_NAMES)), np.nan)
+    first_slice = 0
+    for (stations, repeats, values), slice_count in zip(file_values, slice_counts):
+        temperatures[first_slice + repeats, stations] = values
+        first_slice += slice_count
+    return list(station_index), temperatures
+
+def summarize_temperatures(station_names, temperatures):
+    """
+    Reduces an array of readings to the running totals behind every report.
+
+    A summary holds, for each month, the sum and count of readings and, for
+    each station, the smallest and largest reading, the sum of its yearly
+    averages and the number of years with data. These totals can be merged
+    with `merge_summaries`, so a summary of a whole archive can be built from
+    summaries of its individual files.
+
+    Args:
+        station_names (list): The station name for each row of the array.
+        temperatures (ndarray): Readings of shape `(years, stations, 12)`, NaN where missing.
+
+    Returns:
+        dict: The summary, with the keys `stations`, `month_sums`, `month_counts`,
+              `station_min`, `station_max`, `station_mean_sums` and `station_years`.
+    """
+    temperatures = np.asarray(temperatures, dtype=float) # Sum float32 readings in double precision.
+    valid = ~np.isnan(temperatures) # True wherever a reading exists.
+    readings = np.where(valid, temperatures, 0.0) # Missing readings contribute nothing to sums.
+    year_counts = valid.sum(axis=2)
+    year_has_data = year_counts > 0
+    yearly_averages = np.where(year_has_data, readings.sum(axis=2) / np.maximum(year_counts, 1), 0.0)
+    return {
+        'stations': list(station_names),
+        'month_sums': readings.sum(axis=(0, 1)),
+        'month_counts': valid.sum(axis=(0, 1)),
+        # fmin/fmax skip NaN, so a station is NaN here only when it has no readings at all.
+        'station_min': np.fmin.reduce(temperatures, axis=(0, 2), initial=np.nan),
+        'station_max': np.fmax.reduce(temperatures, axis=(0, 2), initial=np.nan),
+        # Sorting each station's yearly averages before adding them up makes the
+        # total independent of the order in which the years were loaded.
+        'station_mean_sums': np.sort(yearly_averages, axis=0).sum(axis=0),
+        'station_years': year_has_data.sum(axis=0),
+    }
+
+def merge_summaries(summaries):
+    """
+    Combines several summaries into one, as if their readings had been
+    summarized together.
+
+    Stations are matched by name and keep the order in which they first
+    appear. Every station row in a summary counts as a separate year, so a
+    station listed twice in one file contributes two yearly averages. This is
+    how the original script counted such rows, and every loading mode follows
+    it: the dense array and the binary store give each repeated row a slice
+    of its own for the same reason. To merge a long series of summaries, add
+    them to one `SummaryAccumulator` instead of folding them with this function.
+
+    Args:
+        summaries (list): Summaries produced by `summarize_temperatures`.
+
+    Returns:
+        dict: The merged summary. Merging an empty list gives an empty summary.
+    """
+    accumulator = SummaryAccumulator()
+    for summary in summaries:
+        accumulator.add(summary)
+    return accumulator.summary()
+
+class SummaryAccumulator:
+    """
+    Merges summaries one at a time into running totals.
+
+    The station index and the per-station arrays persist between merges and
+    grow as new stations appear, with their capacity doubled each time it
+    runs out. Each merge therefore only looks up the stations of the incoming
+    summary, instead of rebuilding the index of every station merged so far.
+    Stations are matched as in `merge_summaries`.
+    """
+
+    def __init__(self):
+        self.station_index = {} # Map each station name to its position in the totals.
+        self.month_sums = np.zeros(len(MONTH_NAMES))
+        self.month_counts = np.zeros(len(MONTH_NAMES), dtype=np.int64)
+        # Per-station totals; positions past the last station are spare capacity.
+        self.station_min = np.full(0, np.nan)
+        self.station_max = np.full(0, np.nan)
+        self.station_mean_sums = np.zeros(0)
+        self.station_years = np.zeros(0, dtype=np.int64)
+
+    def _reserve(self, station_count):
+        """Makes room in the per-station arrays for at least `station_count` stations."""
+        capacity = len(self.station_years)
+        if station_count <= capacity:
+            return
+        extra = max(station_count, 2 * capacity) - capacity
+        # New stations start without readings: NaN extremes and zero totals.
+        self.station_min = np.concatenate((self.station_min, np.full(extra, np.nan)))
+        self.station_max = np.concatenate((self.station_max, np.full(extra, np.nan)))
+        self.station_mean_sums = np.concatenate((self.station_mean_sums, np.zeros(extra)))
+        self.station_years = np.concatenate((self.station_years, np.zeros(extra, dtype=np.int64)))
+
+    def add(self, summary):
+        """Merges one summary, from `summarize_temperatures` or `merge_summaries`, into the totals."""
+        names = summary['stations']
+        station_index = self.station_index
+        # Most summaries only hold stations seen before, which are looked up without a Python loop.
+        if not station_index.keys() >= set(names):
+            for name in names:
+                station_index.setdefault(name, len(station_index))
+        stations = np.fromiter(map(station_index.__getitem__, names), dtype=np.intp, count=len(names))
+        self._reserve(len(station_index))
+        self.month_sums += summary['month_sums']
+        self.month_counts += summary['month_counts']
+        # The unbuffered '.at' forms accumulate correctly when a station appears more than once.
+        np.fmin.at(self.station_min, stations, summary['station_min'])
+        np.fmax.at(self.station_max, stations, summary['station_max'])
+        np.add.at(self.station_mean_sums, stations, summary['station_mean_sums'])
+        np.add.at(self.station_years, stations, summary['station_years'])
+
+    def summary(self):
+        """
+        Returns the merged summary so far.
+
+        Returns:
+            dict: A summary in the same form as `summarize_temperatures`.
+        """
+        station_count = len(self.station_index)
+        return {
+            'stations': list(self.station_index),
+            'month_sums': self.month_sums.copy(),
+            'month_counts': self.month_counts.copy(),
+            'station_min': self.station_min[:station_count].copy(),
+            'station_max': self.station_max[:station_count].copy(),
+            'station_mean_sums': self.station_mean_sums[:station_count].copy(),
+            'station_years': self.station_years[:station_count].copy(),
+        }
+
+def monthly_averages(summary):
+    """
+    Computes the average temperature of each month over all years and stations.
+
+    Returns:
+        dict: Maps month names to averages, 0 for months without readings.
+    """
+    month_sums = summary['month_sums']
+    month_counts = summary['month_counts']
+    return {month: float(month_sums[i] / month_counts[i]) if month_counts[i] else 0
+            for i, month in enumerate(MONTH_NAMES)}
+
+def seasonal_averages(summary):
+    """
+    Computes the average temperature of each season over all years and stations.
+
+    Returns:
+        dict: Maps season names to averages, 0 for seasons without readings.
+    """
+    month_sums = summary['month_sums']
+    month_counts = summary['month_counts']
+    seasonal = {}
+    for season, months in SEASONS.items():
+        month_indices = [MONTH_NAMES.index(month) for month in months]
+        season_count = month_counts[month_indices].sum()
+        seasonal[season] = float(month_sums[month_indices].sum() / season_count) if season_count else 0
+    return seasonal
+
+def station_ranges(summary):
+    """
+    Computes each station's largest minus smallest reading.
+
+    Returns:
+        dict: Maps station names to ranges, leaving out stations without readings.
+    """
+    ranges = summary['station_max'] - summary['station_min']
+    station_names = summary['stations']
+    return {station_names[i]: float(ranges[i]) for i in np.flatnonzero(summary['station_years'] > 0)}
+
+def station_averages(summary):
+    """
+    Computes the mean of each station's yearly averages.
+
+    Returns:
+        dict: Maps station names to averages, leaving out stations without readings.
+    """
+    averages = summary['station_mean_sums'] / np.maximum(summary['station_years'], 1)
+    station_names = summary['stations']
+    return {station_names[i]: float(averages[i]) for i in np.flatnonzero(summary['station_years'] > 0)}
+
+def summary_statistics(summary):
+    """
+    Derives the report statistics from a summary.
+
+    Args:
+        summary (dict): A summary produced by `summarize_temperatures` or `merge_summaries`.
+
+    Returns:
+        dict: `monthly` and `seasonal` map month and season names to average
+              temperatures (0 when there is no data), `ranges` maps stations to
+              their largest minus smallest reading and `averages` maps stations to
+              the mean of their yearly averages. Stations without any readings
+              are left out of `ranges` and `averages`.
+    """
+    return {'monthly': monthly_averages(summary), 'seasonal': seasonal_averages(summary),
+            'ranges': station_ranges(summary), 'averages': station_averages(summary)}
+
+def compute_temperature_statistics(station_names, temperatures):
+    """
+    Computes every statistic needed for the reports with vectorized reductions.
+
+    Args:
+        station_names (list): The station name for each row of the array.
+        temperatures (ndarray): Readings of shape `(years, stations, 12)`, NaN where missing.
+
+    Returns:
+        dict: The statistics described in `summary_statistics`.
+    """
+    return summary_statistics(summarize_temperatures(station_names, temperatures))
+
+def summarize_files(filepaths):
+    """
+    Parses a group of CSV files and reduces them to a single summary.
+
+    This is the unit of work for the process pool in `summarize_archive`.
+    Only the summaries are kept, never the readings of more than one file.
+
+    Args:
+        filepaths (list): The paths of the files in this group.
+
+    Returns:
+        dict: The merged summary of the files.
+    """
+    accumulator = SummaryAccumulator()
+    for filepath in filepaths:
+        parsed = parse_temperature_file(filepath)
+        if parsed is None:
+            continue # Skip to the next file if headers are missing.
+        names, values, _ = parsed
+        # Each file holds one year, so its rows form a single-year slice.
+        accumulator.add(summarize_temperatures(names, values[np.newaxis]))
+    return accumulator.summary()
+
+def summarize_archive(data_directory, workers=None, tasks_per_worker=4, filepaths=None):
+    """
+    Builds the summary of every CSV file in a directory with a process pool.
+
+    The files are split into groups that worker processes parse and reduce
+    independently (map), and the partial summaries are merged here in file
+    order as they arrive (reduce). Peak memory therefore depends on the number
+    of workers and stations rather than on the number of files.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        workers (int): The number of processes, defaulting to the CPU count.
+                       With a single worker everything runs in this process.
+        tasks_per_worker (int): How many file groups to create per worker,
+                                which evens out the load between them.
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Returns:
+        dict: The summary of the whole archive.
+    """
+    accumulator = SummaryAccumulator()
+    with reporting_load_errors(data_directory):
+        if filepaths is None:
+            filepaths = find_data_files(data_directory)
+        workers = workers or os.cpu_count() or 1
+        group_size = max(1, -(-len(filepaths) // (workers * tasks_per_worker)))
+        groups = [filepaths[start:start + group_size] for start in range(0, len(filepaths), group_size)]
+        if workers == 1:
+            for partial in map(summarize_files, groups):
+                accumulator.add(partial)
+        else:
+            with Pool(workers) as pool:
+                for partial in pool.imap(summarize_files, groups):
+                    accumulator.add(partial)
+    return accumulator.summary()
+
+def iter_temperature_rows(data_directory, filepaths=None):
+    """
+    Yields the readings of every station row in the data directory, one row
+    at a time, without keeping any of them.
+
+    Files are read line by line with `csv.reader`, so only the current row is
+    in memory. Files without the expected headers are skipped with a warning,
+    and loading stops with an error message if a file cannot be read.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Yields:
+        tuple: `(station_name, monthly_temps)` where `monthly_temps` lists the
+               twelve readings, with None for missing ones.
+    """
+    with reporting_load_errors(data_directory):
+        if filepaths is None:
+            filepaths = find_data_files(data_directory)
+        # Iterate through all CSV files within the specified data directory, in a stable order.
+        for filepath in filepaths:
+            # Open each CSV file for reading. 'newline=''' ensures proper handling of line endings.
+            with open(filepath, 'r', newline='') as csvfile:
+                rows = station_rows(csv.reader(csvfile), filepath)
+                if rows is None:
+                    continue # Skip to the next file if headers are missing.
+                for station_name, month_cells, _ in rows:
+                    # Convert each month to float if a value exists, otherwise None.
+                    yield station_name, [float(cell) if cell else None for cell in month_cells]
+
+def accumulate_rows(rows):
+    """
+    Builds a summary from a stream of station rows in a single pass.
+
+    Only running totals are kept: a sum and count per month and, per station,
+    the smallest and largest reading, the sum of its yearly averages and the
+    number of years with data. Memory therefore grows with the number of
+    stations, never with the number of readings.
+
+    Args:
+        rows (iterable): `(station_name, monthly_temps)` pairs, for example from
+                         `iter_temperature_rows`, with None for missing readings.
+
+    Returns:
+        dict: A summary in the same form as `summarize_temperatures`.
+    """
+    month_sums = [0.0] * len(MONTH_NAMES)
+    month_counts = [0] * len(MONTH_NAMES)
+    # Map each station name to [smallest, largest, sum of yearly averages, years, compensation],
+    # where the compensation term carries the rounding error of the sum (Neumaier summation).
+    stations = {}
+    for station, monthly_temps in rows:
+        totals = stations.get(station)
+        if totals is None:
+            totals = stations[station] = [math.inf, -math.inf, 0.0, 0, 0.0]
+        year_sum = 0.0
+        year_count = 0
+        for i, temp in enumerate(monthly_temps):
             if temp is not None:
-                monthly_average_temperatures[i].append(temp) # Add the temperature to the corresponding month's list.
-
-# Calculate the average temperature for each month by summing the temperatures and dividing by the count.
-average_monthly_temps = {MONTH_NAMES[i]: sum(temps) / len(temps) if temps else 0 for i, temps in enumerate(monthly_average_temperatures)}
-
-# Calculate the average temperature for each season across all years and stations.
-seasonal_average_temperatures = {} # Initialize an empty dictionary to store seasonal averages.
-# Iterate through the defined seasons and their corresponding months.
-for season, months in SEASONS.items():
-    seasonal_temps = [] # Initialize an empty list to store temperatures for the current season.
-    # Get the indices of the months belonging to the current season.
-    month_indices = [MONTH_NAMES.index(month) for month in months]
-    # Iterate through the temperature data for each station.
-    for station_data in station_temperatures.values():
-        # Iterate through the yearly temperature data for the current station.
-        for year_data in station_data:
-            # Extract the temperatures for the months belonging to the current season.
-            season_temps_year = [year_data[i] for i in month_indices if year_data[i] is not None]
-            # Extend the seasonal_temps list with the valid temperatures for the current year.
-            if season_temps_year:
-                seasonal_temps.extend(season_temps_year)
-    # Calculate the average temperature for the current season.
-    seasonal_average_temperatures[season] = sum(seasonal_temps) / len(seasonal_temps) if seasonal_temps else 0
-
-# Save the average monthly and seasonal temperatures to "average_temp.txt".
-with open('average_temp.txt', 'w') as outfile:
-    outfile.write("---------------------------------------\n")
-    outfile.write("Average Monthly Temperatures (Celsius)\n")
-    outfile.write("---------------------------------------\n")
-    # Write the average temperature for each month to the output file.
-    for month, avg_temp in average_monthly_temps.items():
-        outfile.write(f"{month}: {avg_temp:.2f}\n")
-    outfile.write("\n")
-    outfile.write("----------------------------------------\n")
-    outfile.write("Average Seasonal Temperatures (Celsius)\n")
-    outfile.write("----------------------------------------\n")
-    # Write the average temperature for each season to the output file.
-    for season, avg_temp in seasonal_average_temperatures.items():
-        outfile.write(f"{season}: {avg_temp:.2f}\n")
-
-# 2. Find the station(s) with the largest temperature range.
-station_temp_ranges = {} # Initialize a dictionary to store the temperature range for each station.
-# Iterate through the temperature data for each station.
-for station, data in station_temperatures.items():
-    all_temps = [] # Initialize a list to store all valid temperatures for the current station.
-    # Iterate through the yearly temperature data for the current station.
-    for year_data in data:
-        # Extend the all_temps list with valid (non-None) temperatures for the current year.
-        all_temps.extend([temp for temp in year_data if temp is not None])
-    # If there are valid temperatures for the station, calculate the temperature range.
-    if all_temps:
-        temp_range = max(all_temps) - min(all_temps) # Calculate the range (max - min).
-        station_temp_ranges[station] = temp_range # Store the range in the dictionary.
-
-largest_range = 0 # Initialize the variable to keep track of the largest temperature range found so far.
-stations_with_largest_range = {} # Initialize a dictionary to store stations with the largest range.
-# Iterate through the calculated temperature ranges for each station.
-for station, temp_range in station_temp_ranges.items():
-    # If the current station's temperature range is greater than the current largest range.
-    if temp_range > largest_range:
-        largest_range = temp_range # Update the largest range.
-        stations_with_largest_range = {station: temp_range} # Reset the dictionary with the current station.
-    # If the current station's temperature range is equal to the current largest range.
-    elif temp_range == largest_range:
-        stations_with_largest_range[station] = temp_range # Add the current station to the dictionary.
-
-# Save the station(s) with the largest temperature range to "largest_temp_range_station.txt".
-with open('largest_temp_range_station.txt', 'w') as outfile:
-    outfile.write("---------------------------------------------------\n")
-    outfile.write("Station(s) with the Largest Temperature Range (Celsius)\n")
-    outfile.write("---------------------------------------------------\n")
-    # Write each station with the largest temperature range and its range to the output file.
-    for station, temp_range in stations_with_largest_range.items():
-        outfile.write(f"{station}: {temp_range:.2f}\n")
-
-# 3. Find the warmest and coolest station(s) based on average yearly temperature.
-station_average_temps = {} # Initialize a dictionary to store the average yearly temperature for each station.
-# Iterate through the temperature data for each station.
-for station, data in station_temperatures.items():
-    all_yearly_averages = [] # Initialize a list to store the average temperature for each year for the current station.
-    # Iterate through the yearly temperature data for the current station.
-    for year_data in data:
-        # Filter out None values (missing temperature readings).
-        valid_temps = [temp for temp in year_data if temp is not None]
-        # If there are valid temperatures for the year, calculate the average.
-        if valid_temps:
-            all_yearly_averages.append(sum(valid_temps) / len(valid_temps))
-    # If there are yearly averages for the station, calculate the overall average.
-    if all_yearly_averages:
-        station_average_temps[station] = sum(all_yearly_averages) / len(all_yearly_averages)
-
-warmest_temp = float('-inf') # Initialize the warmest temperature found so far to negative infinity.
-warmest_stations = {} # Initialize a dictionary to store the warmest station(s) and their average temperature.
-coolest_temp = float('inf') # Initialize the coolest temperature found so far to positive infinity.
-coolest_stations = {} # Initialize a dictionary to store the coolest station(s) and their average temperature.
-
-# Iterate through the calculated average yearly temperatures for each station.
-for station, avg_temp in station_average_temps.items():
-    # Check if the current station's average temperature is greater than the current warmest temperature.
-    if avg_temp > warmest_temp:
-        warmest_temp = avg_temp # Update the warmest temperature.
-        warmest_stations = {station: avg_temp} # Reset the warmest stations dictionary.
-    # Check if the current station's average temperature is equal to the current warmest temperature.
-    elif avg_temp == warmest_temp:
-        warmest_stations[station] = avg_temp # Add the current station to the warmest stations dictionary.
-
-    # Check if the current station's average temperature is less than the current coolest temperature.
-    if avg_temp < coolest_temp:
-        coolest_temp = avg_temp # Update the coolest temperature.
-        coolest_stations = {station: avg_temp} # Reset the coolest stations dictionary.
-    # Check if the current station's average temperature is equal to the current coolest temperature.
-    elif avg_temp == coolest_temp:
-        coolest_stations[station] = avg_temp # Add the current station to the coolest stations dictionary.
-
-# Save the warmest and coolest station(s) to "warmest_and_coolest_station.txt".
-with open('warmest_and_coolest_station.txt', 'w') as outfile:
-    outfile.write("---------------------------------------------------\n")
-    outfile.write("Warmest and Coolest Weather Stations (Average Celsius)\n")
-    outfile.write("---------------------------------------------------\n")
-    outfile.write("Warmest Station(s):\n")
-    # Write each warmest station and its average temperature to the output file.
-    for station, avg_temp in warmest_stations.items():
-        outfile.write(f"- {station}: {avg_temp:.2f}\n")
-    outfile.write("\nCoolest Station(s):\n")
-    # Write each coolest station and its average temperature to the output file.
-    for station, avg_temp in coolest_stations.items():
-        outfile.write(f"- {station}: {avg_temp:.2f}\n")
-
-# Print a message indicating that the analysis has been completed and the results have been saved.
-print("Temperature analysis completed. Results saved to text files.")
+                month_sums[i] += temp
+                month_counts[i] += 1
+                year_sum += temp
+                year_count += 1
+                if temp < totals[0]:
+                    totals[0] = temp
+                if temp > totals[1]:
+                    totals[1] = temp
+        # Only years with at least one reading have an average.
+        if year_count:
+            year_average = year_sum / year_count
+            total = totals[2] + year_average
+            if abs(totals[2]) >= abs(year_average):
+                totals[4] += (totals[2] - total) + year_average
+            else:
+                totals[4] += (year_average - total) + totals[2]
+            totals[2] = total
+            totals[3] += 1
+
+    # Stations seen only with missing readings keep NaN extremes, as in the other summaries.
+    station_totals = np.array(list(stations.values()), dtype=float).reshape(-1, 5)
+    has_data = station_totals[:, 3] > 0
+    return {
+        'stations': list(stations),
+        'month_sums': np.array(month_sums),
+        'month_counts': np.array(month_counts, dtype=np.int64),
+        'station_min': np.where(has_data, station_totals[:, 0], np.nan),
+        'station_max': np.where(has_data, station_totals[:, 1], np.nan),
+        'station_mean_sums': station_totals[:, 2] + station_totals[:, 4],
+        'station_years': station_totals[:, 3].astype(np.int64),
+    }
+
+def _encode_summary(summary):
+    """Serializes a summary to bytes for the cache, without using pickle."""
+    buffer = io.BytesIO()
+    arrays = {key: value for key, value in summary.items() if key != 'stations'}
+    np.savez(buffer, stations=np.array(summary['stations'], dtype=str), **arrays)
+    return buffer.getvalue()
+
+def _decode_summary(blob):
+    """Restores a summary serialized by `_encode_summary`."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        summary = {key: data[key] for key in data.files}
+    summary['stations'] = summary['stations'].tolist()
+    return summary
+
+def summarize_archive_incremental(data_directory, cache_path=CACHE_FILENAME, rebuild=False, workers=1,
+                                  filepaths=None):
+    """
+    Builds the summary of every CSV file in a directory, reusing the cached
+    summaries of files that have not changed since the last run.
+
+    Each file's summary is stored in an SQLite sidecar file together with the
+    file's size and modification time. On the next run only files that are
+    new or whose size or modification time differ are parsed again; the
+    entries of files that have been deleted are dropped from the cache. The
+    summaries are then merged in file name order, exactly as in
+    `summarize_archive`.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        cache_path (str): The path of the SQLite cache file.
+        rebuild (bool): Whether to discard the cached summaries and parse every file.
+        workers (int): The number of processes used to parse changed files,
+                       defaulting to one (no process pool).
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Returns:
+        tuple: `(summary, counts)` where `counts` gives the number of files
+               `reused` from the cache, `parsed` again and `removed` from it.
+    """
+    counts = {'reused': 0, 'parsed': 0, 'removed': 0}
+    accumulator = SummaryAccumulator()
+    with reporting_load_errors(data_directory):
+        if filepaths is None:
+            filepaths = find_data_files(data_directory)
+        directory = os.path.abspath(data_directory)
+        with closing(sqlite3.connect(cache_path)) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS file_summaries ("
+                               "directory TEXT, filename TEXT, size INTEGER, mtime_ns INTEGER, summary BLOB, "
+                               "PRIMARY KEY (directory, filename))")
+            if rebuild:
+                connection.execute("DELETE FROM file_summaries WHERE directory = ?", (directory,))
+            cached = {filename: (size, mtime_ns) for filename, size, mtime_ns in connection.execute(
+                "SELECT filename, size, mtime_ns FROM file_summaries WHERE directory = ?", (directory,))}
+
+            # Compare every file's size and modification time with the cached ones.
+            signatures = {}
+            changed = []
+            for filepath in filepaths:
+                details = os.stat(filepath)
+                filename = os.path.basename(filepath)
+                signatures[filename] = (details.st_size, details.st_mtime_ns)
+                if cached.get(filename) != signatures[filename]:
+                    changed.append(filepath)
+
+            # Forget the files that are no longer in the directory.
+            removed = [(directory, filename) for filename in cached if filename not in signatures]
+            connection.executemany("DELETE FROM file_summaries WHERE directory = ? AND filename = ?", removed)
+            counts['removed'] = len(removed)
+
+            # Parse the new and changed files, one file per task, and store their summaries.
+            tasks = [[filepath] for filepath in changed]
+            with (Pool(workers) if workers != 1 else nullcontext()) as pool:
+                partials = pool.imap(summarize_files, tasks) if pool else map(summarize_files, tasks)
+                for filepath, partial in zip(changed, partials):
+                    filename = os.path.basename(filepath)
+                    connection.execute("INSERT OR REPLACE INTO file_summaries VALUES (?, ?, ?, ?, ?)",
+                                       (directory, filename, *signatures[filename], _encode_summary(partial)))
+            counts['parsed'] = len(changed)
+            counts['reused'] = len(filepaths) - len(changed)
+
+            # Merge the summaries in file name order, holding only one of them at a time.
+            for filepath in filepaths:
+                (blob,) = connection.execute(
+                    "SELECT summary FROM file_summaries WHERE directory = ? AND filename = ?",
+                    (directory, os.path.basename(filepath))).fetchone()
+                accumulator.add(_decode_summary(blob))
+    return accumulator.summary(), counts
+
+def year_from_filename(filename):
+    """
+    Extracts the year from a file name such as 'stations_group_1986.csv'.
+
+    Returns:
+        int: The year, or None if the name does not end in digits before '.csv'.
+    """
+    match = re.search(r'(\d+)\.csv$', filename)
+    return int(match.group(1)) if match else None
+
+def read_archive(data_directory, filepaths=None):
+    """
+    Reads the CSV archive together with the station details and years.
+
+    Unlike `load_temperature_data`, each column is one pair of `STN_ID` (or
+    the station name when a row has no ID) and station name, and the station
+    coordinates are kept, as is the year of each file. A station renamed
+    between years therefore gets a column per name, so that summaries merged
+    by name match the CSV loaders. As there, a station listed more than once
+    in a file gets an extra slice, labelled with the same year, for each
+    repeated row.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Returns:
+        dict: The archive in the form returned by `open_store`, with the
+              temperatures held in memory in double precision, exactly as parsed.
+    """
+    station_index = {} # Map each station key (STN_ID or name, and name) to its column.
+    station_names, latitudes, longitudes = [], [], []
+    file_values = [] # For every file, the station columns and its readings.
+    years = []
+    with reporting_load_errors(data_directory):
+        if filepaths is None:
+            filepaths = find_data_files(data_directory)
+        for filepath in filepaths:
+            parsed = parse_temperature_file(filepath, ('STN_ID', 'LAT', 'LON'))
+            if parsed is None:
+                continue # Skip to the next file if headers are missing.
+            names, values, extras = parsed
+            stations = np.empty(len(names), dtype=np.intp)
+            for row, (name, station_id, latitude, longitude) in enumerate(
+                    zip(names, extras['STN_ID'], extras['LAT'], extras['LON'])):
+                key = (station_id or name, name)
+                if key not in station_index:
+                    station_index[key] = len(station_index)
+                    station_names.append(name)
+                    latitudes.append(float(latitude) if latitude else np.nan)
+                    longitudes.append(float(longitude) if longitude else np.nan)
+                stations[row] = station_index[key]
+            repeats = row_repeats(stations)
+            file_values.append((stations, repeats, values))
+            year = year_from_filename(os.path.basename(filepath))
+            years.extend([-1 if year is None else year] * max(1, int(repeats.max(initial=0)) + 1))
+
+    temperatures = np.full((len(years), len(station_index), len(MONTH_NAMES)), np.nan)
+    first_slice = 0
+    for stations, repeats, values in file_values:
+        temperatures[first_slice + repeats, stations] = values
+        first_slice += max(1, int(repeats.max(initial=0)) + 1)
+    return {
+        'station_ids': [station_id for station_id, _ in station_index],
+        'station_names': station_names,
+        'latitudes': np.array(latitudes, dtype=np.float32),
+        'longitudes': np.array(longitudes, dtype=np.float32),
+        'years': np.array(years, dtype=np.int32),
+        'temperatures': temperatures,
+        'decimals': None,
+    }
+
+def restore_readings(readings, decimals):
+    """
+    Converts stored readings back to the double-precision values parsed from the CSV files.
+
+    Args:
+        readings (ndarray): Readings from an archive or store, NaN where missing.
+        decimals (int): The decimals of the source readings, if they were stored in
+                        single precision; None if they were stored exactly.
+
+    Returns:
+        ndarray: The readings in double precision.
+    """
+    readings = np.asarray(readings, dtype=float)
+    if decimals is None:
+        return readings
+    # Rounding to a whole number and dividing by an exact power of ten gives the
+    # same double as parsing the decimal text, so ties between stations survive.
+    scale = 10.0 ** decimals
+    return np.rint(readings * scale) / scale
+
+def storage_precision(temperatures, max_decimals=4):
+    """
+    Chooses how compactly the readings can be stored without changing any of them.
+
+    Readings with only a few decimals, such as the two of the bundled data,
+    are stored in single precision and restored exactly with
+    `restore_readings`. Anything else is stored in double precision.
+
+    Args:
+        temperatures (ndarray): The double-precision readings, NaN where missing.
+        max_decimals (int): The most decimals tried for single precision.
+
+    Returns:
+        tuple: `(dtype, decimals)`, where `decimals` is None for double precision.
+    """
+    readings = temperatures[~np.isnan(temperatures)]
+    single = readings.astype(np.float32)
+    for decimals in range(max_decimals + 1):
+        if np.array_equal(restore_readings(single, decimals), readings):
+            return np.float32, decimals
+    return np.float64, None
+
+def convert_to_store(data_directory, store_directory=STORE_DIRECTORY, filepaths=None):
+    """
+    Converts the CSV archive into a compact columnar binary store.
+
+    The store is a directory holding three NumPy files:
+
+    - `temperatures.npy`: readings of shape `(years, stations, 12)`, NaN where
+      missing, which `open_store` memory-maps instead of parsing. They are
+      float32 when every reading can be restored exactly from it (see
+      `storage_precision`), and float64 otherwise.
+    - `stations.npz`: the station dictionary, one entry per `STN_ID` (or station
+      name when a row has no ID) and name, with latitudes and longitudes,
+      and the number of decimals to restore float32 readings to (-1 for float64).
+    - `years.npy`: the year of each slice, taken from the file name (-1 if absent);
+      the extra slices of repeated station rows repeat their file's year.
+
+    Args:
+        data_directory (str): The directory holding the `stations_group_*.csv` files.
+        store_directory (str): The directory the store is written to.
+        filepaths (list): The CSV files to read, if already listed with `find_data_files`.
+
+    Returns:
+        tuple: The shape of the stored temperature array.
+    """
+    archive = read_archive(data_directory, filepaths)
+    dtype, decimals = storage_precision(archive['temperatures'])
+    os.makedirs(store_directory, exist_ok=True)
+    np.save(os.path.join(store_directory, 'temperatures.npy'), archive['temperatures'].astype(dtype))
+    np.save(os.path.join(store_directory, 'years.npy'), archive['years'])
+    np.savez(os.path.join(store_directory, 'stations.npz'),
+             ids=np.array(archive['station_ids'], dtype=str),
+             names=np.array(archive['station_names'], dtype=str),
+             latitudes=archive['latitudes'],
+             longitudes=archive['longitudes'],
+             decimals=np.int8(-1 if decimals is None else decimals))
+    return archive['temperatures'].shape
+
+def open_store(store_directory=STORE_DIRECTORY):
+    """
+    Opens a store written by `convert_to_store` without parsing any text.
+
+    The temperature array is memory-mapped read-only, so opening the store is
+    almost instant and only the pages an analysis touches are read from disk.
+    If the store cannot be read, an error is printed and an empty store returned.
+
+    Args:
+        store_directory (str): The directory holding the store.
+
+    Returns:
+        dict: `station_ids`, `station_names`, `latitudes`, `longitudes`, `years`,
+              the memory-mapped `temperatures` array and the `decimals` to pass
+              to `restore_readings` (None when the readings are stored exactly).
+    """
+    try:
+        with np.load(os.path.join(store_directory, 'stations.npz'), allow_pickle=False) as stations:
+            store = {
+                'station_ids': stations['ids'].tolist(),
+                'station_names': stations['names'].tolist(),
+                'latitudes': stations['latitudes'],
+                'longitudes': stations['longitudes'],
+                # Stores written before the precision was recorded are read as they are.
+                'decimals': int(stations['decimals']) if 'decimals' in stations.files else -1,
+            }
+        if store['decimals'] < 0:
+            store['decimals'] = None
+        store['years'] = np.load(os.path.join(store_directory, 'years.npy'))
+        store['temperatures'] = np.load(os.path.join(store_directory, 'temperatures.npy'), mmap_mode='r')
+        return store
+    except FileNotFoundError:
+        print(f"Error: Store not found: {store_directory}")
+    except Exception as e:
+        print(f"An error occurred while opening the store: {e}")
+    return {'station_ids': [], 'station_names': [], 'latitudes': np.empty(0, dtype=np.float32),
+            'longitudes': np.empty(0, dtype=np.float32), 'years': np.empty(0, dtype=np.int32),
+            'temperatures': np.empty((0, 0, len(MONTH_NAMES)), dtype=np.float32), 'decimals': None}
+
+def summarize_store(store, years_per_block=16):
+    """
+    Summarizes a store a block of years at a time.
+
+    Each block is restored to the double-precision readings of the CSV files
+    and summarized on its own, so memory use depends on the block size rather
+    than on the whole archive.
+    Stations are merged by name, matching the CSV loaders.
+
+    Args:
+        store (dict): A store opened with `open_store`.
+        years_per_block (int): The number of yearly slices summarized at once.
+
+    Returns:
+        dict: The summary of the whole store.
+    """
+    accumulator = SummaryAccumulator()
+    temperatures = store['temperatures']
+    for start in range(0, len(temperatures), years_per_block):
+        readings = restore_readings(temperatures[start:start + years_per_block], store['decimals'])
+        accumulator.add(summarize_temperatures(store['station_names'], readings))
+    return accumulator.summary()
+
+class TemperatureDataset:
+    """
+    An indexed view of the archive that answers common questions without
+    scanning every reading.
+
+    Building the dataset makes one pass over the readings to prepare:
+
+    - a station index by name and by `STN_ID`, and a year index kept sorted
+      so that a range of years is found with a binary search;
+    - prefix sums over the years of each station's yearly averages, and of
+      each station's readings per season, so any range of years is answered
+      with two lookups instead of a scan;
+    - the stations ranked by their all-years mean in every season;
+    - a grid of latitude/longitude cells listing the stations inside each one.
+
+    Args:
+        archive (dict): An archive from `read_archive` or `open_store`.
+        grid_size (float): The width and height of a grid cell, in degrees.
+    """
+
+    def __init__(self, archive, grid_size=GRID_SIZE):
+        years = np.asarray(archive['years'])
+        # Visit the slices in year order so that ranges of years are contiguous. Going
+        # through an index array leaves a memory-mapped store where it is, on disk.
+        self._slice_order = np.argsort(years, kind='stable')
+        self.years = years[self._slice_order]
+        self.temperatures = archive['temperatures']
+        self.decimals = archive.get('decimals')
+        self.station_names = list(archive['station_names'])
+        self.station_ids = list(archive['station_ids'])
+        self.latitudes = np.asarray(archive['latitudes'], dtype=float)
+        self.longitudes = np.asarray(archive['longitudes'], dtype=float)
+        self.grid_size = grid_size
+
+        # Station indexes; a name shared by several IDs, or an ID listed under
+        # several names, refers to the first column with it.
+        self.station_index = {}
+        for column, name in enumerate(self.station_names):
+            self.station_index.setdefault(name, column)
+        self.id_index = {}
+        for column, station_id in enumerate(self.station_ids):
+            self.id_index.setdefault(station_id, column)
+
+        # Prefix sums over the years, one year slice at a time so that a
+        # memory-mapped store is never copied into memory as a whole.
+        year_count, station_count = len(years), len(self.station_names)
+        self._mean_prefix = np.zeros((year_count + 1, station_count))
+        self._year_prefix = np.zeros((year_count + 1, station_count), dtype=np.int64)
+        self._season_prefix = {season: (np.zeros((year_count + 1, station_count)),
+                                        np.zeros((year_count + 1, station_count), dtype=np.int64))
+                               for season in SEASONS}
+        for year in range(year_count):
+            readings = self._year_readings(year)
+            valid = ~np.isnan(readings)
+            readings = np.where(valid, readings, 0.0)
+            counts = valid.sum(axis=1)
+            self._mean_prefix[year + 1] = self._mean_prefix[year] + readings.sum(axis=1) / np.maximum(counts, 1)
+            self._year_prefix[year + 1] = self._year_prefix[year] + (counts > 0)
+            for season, (sums, season_counts) in self._season_prefix.items():
+                months = [MONTH_NAMES.index(month) for month in SEASONS[season]]
+                sums[year + 1] = sums[year] + readings[:, months].sum(axis=1)
+                season_counts[year + 1] = season_counts[year] + valid[:, months].sum(axis=1)
+
+        # All-years season means, ranked warmest first, leaving out stations without data.
+        self._season_ranking = {}
+        for season, (sums, season_counts) in self._season_prefix.items():
+            with_data = np.flatnonzero(season_counts[-1] > 0)
+            means = sums[-1, with_data] / season_counts[-1, with_data]
+            self._season_ranking[season] = with_data[np.argsort(-means, kind='stable')]
+
+        # Grid cells of the stations with known coordinates.
+        self.grid = {}
+        located = np.flatnonzero(~np.isnan(self.latitudes) & ~np.isnan(self.longitudes))
+        cells = np.floor(np.column_stack((self.latitudes[located], self.longitudes[located])) / grid_size)
+        for column, cell in zip(located.tolist(), map(tuple, cells.astype(np.int64).tolist())):
+            self.grid.setdefault(cell, []).append(column)
+
+    def _year_readings(self, position):
+        """Returns the readings of the year at a position in year order, as parsed from the CSV files."""
+        return restore_readings(self.temperatures[self._slice_order[position]], self.decimals)
+
+    @classmethod
+    def from_csv(cls, data_directory, grid_size=GRID_SIZE):
+        """Builds the dataset from the CSV files of a data directory."""
+        return cls(read_archive(data_directory), grid_size)
+
+    @classmethod
+    def from_store(cls, store_directory=STORE_DIRECTORY, grid_size=GRID_SIZE):
+        """Builds the dataset from a binary store written by `convert_to_store`."""
+        return cls(open_store(store_directory), grid_size)
+
+    def station_column(self, station):
+        """
+        Finds the column of a station from its name or its `STN_ID`.
+
+        Raises:
+            KeyError: If no station has that name or ID.
+        """
+        if station in self.station_index:
+            return self.station_index[station]
+        if str(station) in self.id_index:
+            return self.id_index[str(station)]
+        raise KeyError(f"Unknown station: {station}")
+
+    def _year_slice(self, first_year=None, last_year=None):
+        """Returns the positions bounding an inclusive range of years, found by binary search."""
+        start = 0 if first_year is None else int(np.searchsorted(self.years, first_year, side='left'))
+        stop = len(self.years) if last_year is None else int(np.searchsorted(self.years, last_year, side='right'))
+        return start, max(start, stop)
+
+    def readings(self, station, year):
+        """
+        Returns the twelve monthly readings of a station in a year.
+
+        Returns:
+            ndarray: The readings, NaN where missing, or None if the year is not in the archive.
+        """
+        start, stop = self._year_slice(year, year)
+        if start == stop:
+            return None
+        column = self.station_column(station)
+        return restore_readings(self.temperatures[self._slice_order[start], column], self.decimals)
+
+    def station_mean(self, station, first_year=None, last_year=None):
+        """
+        Computes the mean of a station's yearly averages over a range of years.
+
+        Args:
+            station (str): The station name or `STN_ID`.
+            first_year (int): The first year included, or None to start at the earliest.
+            last_year (int): The last year included, or None to end at the latest.
+
+        Returns:
+            float: The mean, or None if the station has no readings in those years.
+        """
+        column = self.station_column(station)
+        start, stop = self._year_slice(first_year, last_year)
+        years_with_data = self._year_prefix[stop, column] - self._year_prefix[start, column]
+        if not years_with_data:
+            return None
+        return float((self._mean_prefix[stop, column] - self._mean_prefix[start, column]) / years_with_data)
+
+    def top_stations_in_season(self, season, k=10, coolest=False, first_year=None, last_year=None):
+        """
+        Lists the k warmest (or coolest) stations by their mean reading in a season.
+
+        Over all years the answer is read from the precomputed ranking. For a
+        range of years the season means come from the prefix sums and only
+        the k best are sorted.
+
+        Args:
+            season (str): One of the names in `SEASONS`.
+            k (int): The number of stations to return.
+            coolest (bool): Whether to list the coolest stations instead of the warmest.
+            first_year (int): The first year included, or None to start at the earliest.
+            last_year (int): The last year included, or None to end at the latest.
+
+        Returns:
+            list: `(station_name, mean)` pairs, best first.
+        """
+        sums, counts = self._season_prefix[season]
+        if first_year is None and last_year is None:
+            ranking = self._season_ranking[season]
+            columns = ranking[::-1][:k] if coolest else ranking[:k]
+            return [(self.station_names[column], float(sums[-1, column] / counts[-1, column]))
+                    for column in columns]
+
+        start, stop = self._year_slice(first_year, last_year)
+        range_counts = counts[stop] - counts[start]
+        with_data = np.flatnonzero(range_counts > 0)
+        means = (sums[stop, with_data] - sums[start, with_data]) / range_counts[with_data]
+        keys = means if coolest else -means
+        if k < len(keys):
+            best = np.argpartition(keys, k)[:k]
+        else:
+            best = np.arange(len(keys))
+        best = best[np.argsort(keys[best], kind='stable')]
+        return [(self.station_names[with_data[i]], float(means[i])) for i in best]
+
+    def stations_in_box(self, min_latitude, max_latitude, min_longitude, max_longitude):
+        """
+        Lists the stations inside a latitude/longitude bounding box (edges included).
+
+        Only the grid cells that overlap the box are visited.
+
+        Returns:
+            list: The names of the stations in the box, in station order.
+        """
+        first_row, last_row = (int(math.floor(value / self.grid_size)) for value in (min_latitude, max_latitude))
+        first_column, last_column = (int(math.floor(value / self.grid_size)) for value in (min_longitude, max_longitude))
+        candidates = [column
+                      for row in range(first_row, last_row + 1)
+                      for grid_column in range(first_column, last_column + 1)
+                      for column in self.grid.get((row, grid_column), ())]
+        inside = [column for column in sorted(candidates)
+                  if min_latitude <= self.latitudes[column] <= max_latitude
+                  and min_longitude <= self.longitudes[column] <= max_longitude]
+        return [self.station_names[column] for column in inside]
+
+def find_extreme_stations(values, largest=True, tolerance=EXTREME_TOLERANCE):
+    """
+    Finds every station sharing the largest (or smallest) value.
+
+    Values within `tolerance` of the extreme count as ties, so stations whose
+    averages differ only by floating-point rounding are reported together
+    whatever order their readings were added up in.
+
+    Args:
+        values (dict): Maps station names to a statistic.
+        largest (bool): Whether to look for the largest rather than the smallest value.
+        tolerance (float): The largest difference from the extreme still treated as a tie.
+
+    Returns:
+        dict: The stations holding the extreme value, mapped to their values, in station order.
+    """
+    if not values:
+        return {}
+    stations = list(values)
+    numbers = np.fromiter(values.values(), dtype=float, count=len(values))
+    extreme = numbers.max() if largest else numbers.min()
+    return {stations[i]: values[stations[i]] for i in np.flatnonzero(np.abs(numbers - extreme) <= tolerance)}
+
+def rank_stations(values, k, largest=True):
+    """
+    Lists the k stations with the largest (or smallest) values.
+
+    Only the candidates found by a partial sort are ordered. Stations with
+    equal values are ordered by name, so the result does not depend on the
+    order of the input.
+
+    Args:
+        values (dict): Maps station names to a statistic.
+        k (int): The number of stations to return.
+        largest (bool): Whether to rank the largest values first rather than the smallest.
+
+    Returns:
+        list: `(station_name, value)` pairs, best first.
+    """
+    if not values or k <= 0:
+        return []
+    stations = list(values)
+    keys = np.fromiter(values.values(), dtype=float, count=len(values))
+    if largest:
+        keys = -keys
+    if k < len(keys):
+        # Keep every station tied with the k-th best, then settle the ties by name.
+        threshold = np.partition(keys, k - 1)[k - 1]
+        candidates = np.flatnonzero(keys <= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    best = sorted(candidates.tolist(), key=lambda i: (keys[i], stations[i]))[:k]
+    return [(stations[i], values[stations[i]]) for i in best]
+
+def write_average_report(filename, monthly, seasonal):
+    """Saves the average monthly and seasonal temperatures."""
+    with open(filename, 'w') as outfile:
+        outfile.write("---------------------------------------\n")
+        outfile.write("Average Monthly Temperatures (Celsius)\n")
+        outfile.write("---------------------------------------\n")
+        # Write the average temperature for each month to the output file.
+        for month, avg_temp in monthly.items():
+            outfile.write(f"{month}: {avg_temp:.2f}\n")
+        outfile.write("\n")
+        outfile.write("----------------------------------------\n")
+        outfile.write("Average Seasonal Temperatures (Celsius)\n")
+        outfile.write("----------------------------------------\n")
+        # Write the average temperature for each season to the output file.
+        for season, avg_temp in seasonal.items():
+            outfile.write(f"{season}: {avg_temp:.2f}\n")
+
+def write_range_report(filename, stations_with_largest_range):
+    """Saves the station(s) with the largest temperature range."""
+    with open(filename, 'w') as outfile:
+        outfile.write("---------------------------------------------------\n")
+        outfile.write("Station(s) with the Largest Temperature Range (Celsius)\n")
+        outfile.write("---------------------------------------------------\n")
+        # Write each station with the largest temperature range and its range to the output file.
+        for station, temp_range in stations_with_largest_range.items():
+            outfile.write(f"{station}: {temp_range:.2f}\n")
+
+def write_extremes_report(filename, warmest_stations, coolest_stations):
+    """Saves the warmest and coolest station(s)."""
+    with open(filename, 'w') as outfile:
+        outfile.write("---------------------------------------------------\n")
+        outfile.write("Warmest and Coolest Weather Stations (Average Celsius)\n")
+        outfile.write("---------------------------------------------------\n")
+        outfile.write("Warmest Station(s):\n")
+        # Write each warmest station and its average temperature to the output file.
+        for station, avg_temp in warmest_stations.items():
+            outfile.write(f"- {station}: {avg_temp:.2f}\n")
+        outfile.write("\nCoolest Station(s):\n")
+        # Write each coolest station and its average temperature to the output file.
+        for station, avg_temp in coolest_stations.items():
+            outfile.write(f"- {station}: {avg_temp:.2f}\n")
+
+def write_top_stations_report(filename, statistics, k):
+    """Saves the k warmest, coolest and widest-range stations."""
+    sections = [
+        (f"{k} Warmest Stations (Average Celsius)", rank_stations(statistics['averages'], k)),
+        (f"{k} Coolest Stations (Average Celsius)", rank_stations(statistics['averages'], k, largest=False)),
+        (f"{k} Stations with the Largest Temperature Range (Celsius)", rank_stations(statistics['ranges'], k)),
+    ]
+    with open(filename, 'w') as outfile:
+        for position, (title, ranking) in enumerate(sections):
+            if position:
+                outfile.write("\n")
+            outfile.write("---------------------------------------------------\n")
+            outfile.write(f"{title}\n")
+            outfile.write("---------------------------------------------------\n")
+            # Write each station with its rank and value to the output file.
+            for rank, (station, value) in enumerate(ranking, start=1):
+                outfile.write(f"{rank}. {station}: {value:.2f}\n")
+
+def find_report_extremes(statistics, tolerance=EXTREME_TOLERANCE):
+    """
+    Finds the stations named in the range and warmest/coolest reports.
+
+    Args:
+        statistics (dict): The result of `compute_temperature_statistics`.
+        tolerance (float): The largest difference from an extreme still treated as a tie.
+
+    Returns:
+        dict: `largest_range`, `warmest` and `coolest`, each mapping stations to their values.
+    """
+    return {
+        'largest_range': find_extreme_stations(statistics['ranges'], tolerance=tolerance),
+        'warmest': find_extreme_stations(statistics['averages'], tolerance=tolerance),
+        'coolest': find_extreme_stations(statistics['averages'], largest=False, tolerance=tolerance),
+    }
+
+def write_reports(statistics, extremes, top=None):
+    """
+    Writes the three report files from the computed statistics.
+
+    Args:
+        statistics (dict): The result of `compute_temperature_statistics`.
+        extremes (dict): The result of `find_report_extremes`.
+        top (int): If given, also list this many warmest, coolest and
+                   widest-range stations in "top_stations.txt".
+    """
+    # Save the average monthly and seasonal temperatures to "average_temp.txt".
+    write_average_report('average_temp.txt', statistics['monthly'], statistics['seasonal'])
+    # Save the station(s) with the largest temperature range to "largest_temp_range_station.txt".
+    write_range_report('largest_temp_range_station.txt', extremes['largest_range'])
+    # Save the warmest and coolest station(s) to "warmest_and_coolest_station.txt".
+    write_extremes_report('warmest_and_coolest_station.txt', extremes['warmest'], extremes['coolest'])
+    if top:
+        # Save the top stations to "top_stations.txt".
+        write_top_stations_report('top_stations.txt', statistics, top)
+
+class PipelineProfiler:
+    """
+    Times the stages of the analysis and, when enabled, measures their peak
+    memory with `tracemalloc` and reports both.
+
+    Memory allocated inside worker processes is not traced, so in the
+    map-reduce mode the peaks cover the main process only.
+
+    Args:
+        enabled (bool): Whether to trace memory and produce a report.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = [] # One record per finished stage, in order.
+        self.files = 0 # The number of CSV files found.
+        self.rows = 0 # The number of station-years with readings, used for rows/sec.
+
+    def start(self):
+        """Starts tracing memory allocations if profiling is enabled."""
+        if self.enabled:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Times the code inside the `with` block as one named stage."""
+        if self.enabled:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {'name': name, 'seconds': time.perf_counter() - start}
+            if self.enabled:
+                record['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.stages.append(record)
+
+    def report(self, filename, mode):
+        """
+        Prints a table of the stages and saves it as JSON.
+
+        Args:
+            filename (str): The JSON file to write.
+            mode (str): The processing mode, recorded in the JSON summary.
+        """
+        if not self.enabled:
+            return
+        tracemalloc.stop()
+        for record in self.stages:
+            # The discovery stage handles files, every other stage the rows found in them.
+            record['rows'] = self.files if record['name'] == 'discover' else self.rows
+            record['rows_per_second'] = record['rows'] / record['seconds'] if record['seconds'] else None
+        print(f"{'stage':<10}{'seconds':>10}{'rows/s':>14}{'peak MB':>10}")
+        for record in self.stages:
+            rate = f"{record['rows_per_second']:.0f}" if record['rows_per_second'] is not None else "-"
+            print(f"{record['name']:<10}{record['seconds']:>10.4f}{rate:>14}"
+                  f"{record['peak_memory_bytes'] / 1e6:>10.2f}")
+        with open(filename, 'w') as outfile:
+            json.dump({'mode': mode, 'files': self.files, 'rows': self.rows,
+                       'total_seconds': sum(record['seconds'] for record in self.stages),
+                       'stages': self.stages}, outfile, indent=2)
+            outfile.write("\n")
+
+def parse_arguments(argv=None):
+    """
+    Reads the data directory and processing mode from the command line.
+
+    Args:
+        argv (list): The arguments to parse, defaulting to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Analyse the yearly station temperature files and write the reports.")
+    parser.add_argument("-d", "--data-directory", default=DATA_DIRECTORY,
+                        help=f"directory holding the stations_group_*.csv files (default: {DATA_DIRECTORY})")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("-w", "--workers", type=int,
+                      help="summarize the files with this many processes (map-reduce mode) "
+                           "instead of loading them all into one array")
+    mode.add_argument("-s", "--stream", action="store_true",
+                      help="compute the reports in a single streaming pass over the rows, "
+                           "without holding any readings in memory")
+    mode.add_argument("--store", nargs="?", const=STORE_DIRECTORY, metavar="PATH",
+                      help="analyse the memory-mapped binary store instead of the CSV files "
+                           f"(default store: {STORE_DIRECTORY})")
+    parser.add_argument("--convert", action="store_true",
+                        help="convert the CSV files into the binary store first (implies --store)")
+    parser.add_argument("-c", "--cache", nargs="?", const=CACHE_FILENAME, metavar="PATH",
+                        help="reuse the cached summaries of unchanged files and parse only new or "
+                             f"changed ones (default cache file: {CACHE_FILENAME})")
+    parser.add_argument("--top", type=int, metavar="N",
+                        help="also write the N warmest, coolest and widest-range stations to top_stations.txt")
+    parser.add_argument("--tolerance", type=float, default=EXTREME_TOLERANCE,
+                        help="largest difference from the warmest, coolest or largest range that "
+                             f"still counts as a tie (default: {EXTREME_TOLERANCE})")
+    parser.add_argument("--profile", action="store_true",
+                        help="report the time, rows/sec and peak memory of every stage and save "
+                             f"them to {PROFILE_FILENAME}")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="discard the cached summaries and parse every file again (implies --cache)")
+    options = parser.parse_args(argv)
+    if options.rebuild and options.cache is None:
+        options.cache = CACHE_FILENAME
+    if options.convert and options.store is None:
+        options.store = STORE_DIRECTORY
+    if options.cache is not None and (options.stream or options.store is not None):
+        parser.error("argument -c/--cache: not allowed with argument -s/--stream or --store")
+    if options.top is not None and options.top < 1:
+        parser.error("argument --top: must be at least 1")
+    if options.workers is not None and options.workers < 1:
+        parser.error("argument -w/--workers: must be at least 1")
+    if not options.tolerance >= 0:
+        parser.error("argument --tolerance: must be a non-negative number")
+    return options
+
+def main(argv=None):
+    """Loads the temperature data, analyses it and saves the reports, one timed stage at a time."""
+    options = parse_arguments(argv)
+    profiler = PipelineProfiler(options.profile)
+    profiler.start()
+
+    # Find the CSV files, unless the reports come from an existing binary store.
+    filepaths = []
+    if options.store is None or options.convert:
+        with profiler.stage('discover'):
+            try:
+                filepaths = find_data_files(options.data_directory)
+            except FileNotFoundError:
+                print(f"Error: Directory not found: {options.data_directory}")
+        profiler.files = len(filepaths)
+
+    # Read the data and reduce it to a summary, in the selected mode.
+    if options.store is not None:
+        mode = 'store'
+        with profiler.stage('parse'):
+            if options.convert:
+                convert_to_store(options.data_directory, options.store, filepaths)
+            store = open_store(options.store)
+        with profiler.stage('summarize'):
+            summary = summarize_store(store)
+    elif options.cache is not None:
+        mode = 'cache'
+        with profiler.stage('parse'):
+            summary, counts = summarize_archive_incremental(options.data_directory, options.cache, options.rebuild,
+                                                            options.workers or 1, filepaths)
+        print(f"Summary cache: {counts['reused']} file(s) reused, {counts['parsed']} parsed, "
+              f"{counts['removed']} removed.")
+    elif options.workers is not None:
+        mode = 'map-reduce'
+        with profiler.stage('parse'):
+            summary = summarize_archive(options.data_directory, options.workers, filepaths=filepaths)
+    elif options.stream:
+        mode = 'stream'
+        with profiler.stage('parse'):
+            summary = accumulate_rows(iter_temperature_rows(options.data_directory, filepaths))
+    else:
+        mode = 'array'
+        with profiler.stage('parse'):
+            station_names, temperatures = load_temperature_data(options.data_directory, filepaths)
+        with profiler.stage('summarize'):
+            summary = summarize_temperatures(station_names, temperatures)
+    profiler.rows = int(summary['station_years'].sum())
+
+    # Compute the statistics and write the reports.
+    with profiler.stage('monthly'):
+        monthly = monthly_averages(summary)
+    with profiler.stage('seasonal'):
+        seasonal = seasonal_averages(summary)
+    with profiler.stage('range'):
+        ranges = station_ranges(summary)
+    with profiler.stage('extremes'):
+        statistics = {'monthly': monthly, 'seasonal': seasonal, 'ranges': ranges,
+                      'averages': station_averages(summary)}
+        extremes = find_report_extremes(statistics, options.tolerance)
+    with profiler.stage('write'):
+        write_reports(statistics, extremes, options.top)
+    # Print a message indicating that the analysis has been completed and the results have been saved.
+    print("Temperature analysis completed. Results saved to text files.")
+    profiler.report(PROFILE_FILENAME, mode)
+
+if __name__ == "__main__":
+    main()
 
 
 # In[ ]:
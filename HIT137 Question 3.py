@@ -4,7 +4,43 @@
 # In[3]:
 
 
-import turtle  # Importing the necessary module for turtle graphics
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import product
+from multiprocessing import Pool
+from operator import itemgetter
+import numpy as np  # Importing NumPy to compute whole levels of the tree at once
+
+try:
+    import turtle  # Importing the necessary module for turtle graphics
+except ImportError:
+    turtle = None  # Headless machines without tkinter can still render to PNG and SVG.
+
+# Where `initiate_tree` starts the trunk, and the direction it grows in (degrees, 90 = up).
+START_POSITION = (0.0, -200.0)
+START_HEADING = 90.0
+
+# The "forest green" of the leaves as 0-255 RGB values, for the headless renderers.
+LEAF_RGB = (34, 139, 34)
+
+# The memory budget of a subtree cache, and the record of the trees written by a sweep.
+SUBTREE_CACHE_BYTES = 256 * 1024 * 1024
+SWEEP_MANIFEST_FILENAME = 'sweep_manifest.jsonl'
+
+def branch_thickness(levels):
+    """Returns the pen size of a branch with `levels` branching levels remaining."""
+    return int(levels * 1.5)  # Thicker branches at the base for a more natural look.
+
+def branch_color(levels):
+    """Returns the brownish RGB colour of a branch with `levels` branching levels remaining."""
+    return (0.4 + 0.6 * levels / 8, 0.2, 0.15)  # The color slightly lightens at higher levels.
 
 def build_tree(painter, trunk_length, left_turn, right_turn, levels, shrink_factor):
     """
@@ -32,12 +68,8 @@ def build_tree(painter, trunk_length, left_turn, right_turn, levels, shrink_fact
         painter.dot(trunk_length * 0.6)  # Draw a small circle representing a leaf.
         return  # End the function call for this branch.
 
-    branch_thickness = int(levels * 1.5)  # Determine the thickness of the current branch.
-                                         # Thicker branches at the base for a more natural look.
-    painter.pensize(branch_thickness)  # Set the thickness of the pen.
-    branch_color = (0.4 + 0.6 * levels / 8, 0.2, 0.15)  # Define a brownish color for the branches.
-                                                       # The color slightly lightens at higher levels.
-    painter.color(branch_color)  # Set the color of the pen for drawing the branch.
+    painter.pensize(branch_thickness(levels))  # Set the thickness of the pen for the current branch.
+    painter.color(branch_color(levels))  # Set the color of the pen for drawing the branch.
 
     painter.forward(trunk_length)  # Draw the current branch forward.
 
@@ -55,19 +87,476 @@ def build_tree(painter, trunk_length, left_turn, right_turn, levels, shrink_fact
     painter.backward(trunk_length)  # Move the turtle back to the starting point of the current branch.
                                    # This is crucial for drawing the subsequent branches correctly.
 
-def initiate_tree():
+def iter_tree_levels(trunk_length, left_turn, right_turn, levels, shrink_factor,
+                     start=START_POSITION, heading=START_HEADING):
     """
-    Sets up the turtle graphics environment and gets user input to draw a tree.
-    This function handles the initial setup and user interaction.
+    Computes the branches of a fractal tree one level at a time, without
+    recursion and without drawing anything.
+
+    The tree is the one `build_tree` draws, built breadth-first: every branch
+    of a level is handled at once, with positions and directions held as
+    NumPy complex numbers. A branch ends at `start + length * direction`, and
+    its two children start there with the direction turned left by
+    `left_turn` or right by `right_turn`, which is a single multiplication
+    by a precomputed rotation for the whole level.
+
+    Args:
+        trunk_length (float): The length of the trunk.
+        left_turn (float): The angle in degrees to turn left for a new branch.
+        right_turn (float): The angle in degrees to turn right for a new branch.
+        levels (int): The number of branching levels.
+        shrink_factor (float): The factor by which subsequent branch lengths are reduced.
+        start (tuple): The `(x, y)` position of the bottom of the trunk.
+        heading (float): The direction of the trunk in degrees, 90 being straight up.
+
+    Yields:
+        tuple: `(remaining, starts, ends)` for every level from the trunk
+               upwards, where `remaining` is the number of levels left
+               (`levels` for the trunk, 1 for the outermost branches) and
+               `starts` and `ends` are complex arrays of the branch end points.
+               A left child always directly precedes its right sibling.
     """
-    try:
-        angle_left = float(input("Specify the left branch angle (e.g., 20): "))  # Enter the angle (in degrees) for the left branches (e.g., 20).
-        angle_right = float(input("Indicate the right branch angle (e.g.,25): "))  # Enter the angle (in degrees) for the right branches (e.g., 25).
-        initial_length = float(input("Set the starting branch length (e.g.,100): "))  # Enter the length of the initial trunk (e.g., 100).
-        depth_level = int(input("Determine the recursion depth (e.g.,5): "))  # Enter the number of branching levels (e.g., 5).
-        reduction = float(input("Define the branch length reduction factor (e.g., 0.65): "))
-        # Enter a value between 0 and 1 to reduce branch length at each level (e.g., 0.7).
+    if levels < 0:
+        raise ValueError("The number of levels cannot be negative.")
+    starts = np.array([complex(*start)])  # The trunk is the only branch of the first level.
+    directions = np.exp(1j * np.radians([heading]))  # Unit vectors pointing along each branch.
+    # Turning left or right is a rotation of the direction vectors.
+    turns = np.exp(1j * np.radians([left_turn, -right_turn]))
+    length = trunk_length
+    for remaining in range(levels, 0, -1):
+        ends = starts + length * directions  # Draw every branch of this level at once.
+        yield remaining, starts, ends
+        # Each branch gets a left and a right child, starting where it ends.
+        starts = np.repeat(ends, 2)
+        directions = np.multiply.outer(directions, turns).ravel()
+        length *= shrink_factor
+
+def compute_tree_geometry(trunk_length, left_turn, right_turn, levels, shrink_factor,
+                          start=START_POSITION, heading=START_HEADING):
+    """
+    Computes every branch and leaf of a fractal tree as flat NumPy arrays.
+
+    This gives the same tree as `build_tree`, with the same thickness, colour
+    and leaf rules, but needs no turtle and no display, and handles depths of
+    20 and more (millions of branches) in seconds.
+
+    Args:
+        trunk_length (float): The length of the trunk.
+        left_turn (float): The angle in degrees to turn left for a new branch.
+        right_turn (float): The angle in degrees to turn right for a new branch.
+        levels (int): The number of branching levels.
+        shrink_factor (float): The factor by which subsequent branch lengths are reduced.
+        start (tuple): The `(x, y)` position of the bottom of the trunk.
+        heading (float): The direction of the trunk in degrees, 90 being straight up.
+
+    Returns:
+        dict: `segments` is a float array of shape `(2**levels - 1, 4)` holding
+              `(x0, y0, x1, y1)` for every branch, level by level from the trunk
+              upwards. `levels` holds the remaining levels of each branch, from
+              which `branch_thickness` and `branch_color` give its pen size and
+              colour. `leaves` is a float array of shape `(2**levels, 2)` with
+              the centre of every leaf and `leaf_size` their common diameter.
+    """
+    # Each row holds a branch's start and end as complex numbers, which viewed as
+    # floats are exactly the `(x0, y0, x1, y1)` rows of `segments`.
+    points = np.empty((2 ** levels - 1, 2), dtype=complex)
+    segment_levels = np.empty(2 ** levels - 1, dtype=np.int16)
+    leaves = np.array([complex(*start)])  # Without any levels, the tree is a single leaf.
+    for remaining, starts, ends in iter_tree_levels(trunk_length, left_turn, right_turn, levels,
+                                                    shrink_factor, start, heading):
+        first = len(starts) - 1  # Level k holds 2**k branches and starts at row 2**k - 1.
+        rows = slice(first, first + len(starts))
+        points[rows, 0], points[rows, 1] = starts, ends
+        segment_levels[rows] = remaining
+        if remaining == 1:
+            leaves = np.repeat(ends, 2)  # Both children of an outermost branch are leaves at its end.
+    return {
+        'segments': points.view(np.float64),
+        'levels': segment_levels,
+        'leaves': np.column_stack((leaves.real, leaves.imag)),
+        'leaf_size': trunk_length * shrink_factor ** levels * 0.6,
+    }
+
+def iter_geometry_levels(geometry):
+    """
+    Yields the levels of a computed tree in the form `iter_tree_levels` uses.
+
+    Args:
+        geometry (dict): A result of `compute_tree_geometry` or `cached_tree_geometry`.
+
+    Yields:
+        tuple: `(remaining, starts, ends)` for every level from the trunk upwards.
+    """
+    segments = geometry['segments']
+    levels = int(geometry['levels'][0]) if len(segments) else 0
+    for level in range(levels):
+        rows = slice(2 ** level - 1, 2 ** (level + 1) - 1)
+        yield (levels - level, segments[rows, 0] + 1j * segments[rows, 1],
+               segments[rows, 2] + 1j * segments[rows, 3])
+
+class SubtreeCache:
+    """
+    Keeps canonical tree geometry for reuse, within a memory budget.
+
+    A canonical tree has a trunk of length 1 that starts at 0 and points
+    along the x axis; any tree with the same `left_turn`, `right_turn` and
+    `shrink_factor` is a rotated, scaled and shifted copy of it. Its branch
+    end points are held as one complex array in the breadth-first order of
+    `iter_tree_levels`, in which the first `2**levels - 1` points form the
+    canonical tree of `levels` levels, so one entry per angle and shrink
+    factor serves every depth up to the deepest one requested so far.
+
+    Deeper trees are grown from the cached one a level at a time: the tree
+    with one more level is a unit trunk carrying two shrunk, turned copies of
+    the cached tree, one on either side. When the cached arrays use more than
+    `max_bytes`, the least recently used entries are evicted.
+
+    Args:
+        max_bytes (int): The memory budget for the cached arrays.
+    """
+
+    def __init__(self, max_bytes=SUBTREE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # Canonical end points by (left_turn, right_turn, shrink_factor), oldest first.
+        self.size = 0  # The bytes held in `entries`.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def canonical_ends(self, left_turn, right_turn, shrink_factor, levels):
+        """
+        Returns the branch end points of a canonical tree, building and caching them if needed.
+
+        Returns:
+            numpy.ndarray: A read-only complex array of `2**levels - 1` end points.
+        """
+        key = (left_turn, right_turn, shrink_factor)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)  # Most recently used.
+        if cached is not None and len(cached) >= 2 ** levels - 1:
+            self.hits += 1
+            return cached[:2 ** levels - 1]
+        self.misses += 1
+        ends = grow_canonical_tree(cached, left_turn, right_turn, shrink_factor, levels)
+        ends.flags.writeable = False  # Every tree built from the entry shares it.
+        # Replace the shallower entry only if the deeper one fits; otherwise the
+        # shallower one stays cached for the depths it can still serve.
+        if ends.nbytes <= self.max_bytes:
+            if cached is not None:
+                del self.entries[key]
+                self.size -= cached.nbytes
+            self.entries[key] = ends
+            self.size += ends.nbytes
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.nbytes
+                self.evictions += 1
+        return ends[:2 ** levels - 1]
+
+    def info(self):
+        """Reports how well the cache is working, like `functools.lru_cache.cache_info`."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.entries), 'bytes': self.size}
+
+def grow_canonical_tree(ends, left_turn, right_turn, shrink_factor, levels):
+    """
+    Extends the end points of a canonical tree (see `SubtreeCache`) to `levels` levels.
+
+    Args:
+        ends (numpy.ndarray): The end points of a shallower canonical tree with
+                              the same angles and shrink factor, or None.
+        left_turn, right_turn, shrink_factor: As for `build_tree`.
+        levels (int): The number of levels wanted.
+
+    Returns:
+        numpy.ndarray: The complex end points of the canonical tree of `levels` levels.
+    """
+    if ends is None or len(ends) == 0:
+        # With nothing to grow from, compute the whole tree at once.
+        parts = [level_ends for _, _, level_ends in iter_tree_levels(1.0, left_turn, right_turn, levels,
+                                                                     shrink_factor, (0.0, 0.0), 0.0)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=complex)
+    # The subtrees on either side of the trunk are the current tree, shrunk and turned.
+    left_copy, right_copy = shrink_factor * np.exp(1j * np.radians([left_turn, -right_turn]))
+    depth = (len(ends) + 1).bit_length() - 1
+    while depth < levels:
+        grown = np.empty(2 ** (depth + 1) - 1, dtype=complex)
+        grown[0] = 1  # The unit trunk ends at 1.
+        for level in range(depth):
+            # Level `level` of each copy becomes level `level + 1` of the grown tree,
+            # the left copy's branches first, as in `iter_tree_levels`.
+            part = ends[2 ** level - 1:2 ** (level + 1) - 1]
+            first = 2 ** (level + 1) - 1
+            grown[first:first + len(part)] = 1 + left_copy * part
+            grown[first + len(part):first + 2 * len(part)] = 1 + right_copy * part
+        ends, depth = grown, depth + 1
+    return ends
+
+def cached_tree_geometry(cache, trunk_length, left_turn, right_turn, levels, shrink_factor,
+                         start=START_POSITION, heading=START_HEADING):
+    """
+    Computes a tree like `compute_tree_geometry`, by placing a cached canonical tree.
+
+    Placing the tree takes one complex multiplication and addition per
+    branch: the trunk length and heading scale and rotate the canonical
+    tree, and the start position shifts it.
+
+    Args:
+        cache (SubtreeCache): The cache to take the canonical tree from.
+        trunk_length, left_turn, right_turn, levels, shrink_factor, start, heading:
+            As for `compute_tree_geometry`.
+
+    Returns:
+        dict: The same arrays as `compute_tree_geometry`, in the same order.
+    """
+    if levels < 0:
+        raise ValueError("The number of levels cannot be negative.")
+    origin = complex(*start)
+    # Each row holds a branch's start and end as complex numbers, which viewed as
+    # floats are exactly the `(x0, y0, x1, y1)` rows of `segments`.
+    points = np.empty((2 ** levels - 1, 2), dtype=complex)
+    points[:, 1] = origin + trunk_length * np.exp(1j * np.radians(heading)) * cache.canonical_ends(
+        left_turn, right_turn, shrink_factor, levels)
+    if levels:
+        points[0, 0] = origin
+        # Every branch above the trunk starts where its parent ends.
+        points[1:, 0] = np.repeat(points[:2 ** (levels - 1) - 1, 1], 2)
+        leaves = np.repeat(points[2 ** (levels - 1) - 1:, 1], 2)
+    else:
+        leaves = np.array([origin])
+    return {
+        'segments': points.view(np.float64),
+        'levels': np.repeat(np.arange(levels, 0, -1, dtype=np.int16), 2 ** np.arange(levels)),
+        'leaves': np.column_stack((leaves.real, leaves.imag)),
+        'leaf_size': trunk_length * shrink_factor ** levels * 0.6,
+    }
+
+def tree_bounds(trunk_length, left_turn, right_turn, levels, shrink_factor,
+                start=START_POSITION, heading=START_HEADING, geometry=None):
+    """
+    Finds the smallest box holding every branch and leaf of a fractal tree.
+
+    Args:
+        geometry (dict): The tree's `compute_tree_geometry` result, if already
+                         computed; otherwise it is computed level by level.
+
+    Returns:
+        tuple: `(min_x, min_y, max_x, max_y)` in turtle coordinates.
+    """
+    min_point = max_point = complex(*start)
+    if geometry is None:
+        tree_levels = iter_tree_levels(trunk_length, left_turn, right_turn, levels, shrink_factor, start, heading)
+    else:
+        tree_levels = iter_geometry_levels(geometry)
+    for remaining, starts, ends in tree_levels:
+        min_point = complex(min(min_point.real, ends.real.min()), min(min_point.imag, ends.imag.min()))
+        max_point = complex(max(max_point.real, ends.real.max()), max(max_point.imag, ends.imag.max()))
+    leaf_radius = trunk_length * shrink_factor ** levels * 0.3  # Leaves stick out by half their size.
+    return (min_point.real - leaf_radius, min_point.imag - leaf_radius,
+            max_point.real + leaf_radius, max_point.imag + leaf_radius)
+
+def canvas_transform(size, bounds=None, margin=10):
+    """
+    Works out how turtle coordinates map to image pixels.
+
+    Args:
+        size (tuple): The `(width, height)` of the image in pixels.
+        bounds (tuple): If given, the `(min_x, min_y, max_x, max_y)` box to scale
+                        and centre in the image; otherwise the image shows what
+                        the turtle window of the same size would, with (0, 0)
+                        in the middle.
+        margin (int): The space in pixels kept free around `bounds`.
+
+    Returns:
+        tuple: `(scale, offset_x, offset_y)`, so that a point `(x, y)` lands on
+               pixel `(offset_x + scale * x, offset_y - scale * y)`.
+    """
+    width, height = size
+    if bounds is None:
+        return 1.0, width / 2, height / 2
+    min_x, min_y, max_x, max_y = bounds
+    scale = min((width - 2 * margin) / max(max_x - min_x, 1e-9), (height - 2 * margin) / max(max_y - min_y, 1e-9))
+    return scale, width / 2 - scale * (min_x + max_x) / 2, height / 2 + scale * (min_y + max_y) / 2
+
+def rgb_bytes(color):
+    """
+    Converts an RGB colour with components from 0 to 1 to 0-255 integers.
+
+    Components are clamped to [0, 1]: `branch_color` goes above 1 for
+    branches with more than 8 levels remaining, which turtle rejects outright.
+    """
+    return tuple(int(round(min(max(component, 0.0), 1.0) * 255)) for component in color)
+
+def write_png(filename, pixels):
+    """
+    Saves an RGB image as a PNG file, using only `zlib` and NumPy.
+
+    Args:
+        filename (str): The file to write.
+        pixels (numpy.ndarray): An array of shape `(height, width, 3)` and dtype uint8.
+    """
+    height, width = pixels.shape[:2]
+
+    def chunk(kind, data):
+        # Every PNG chunk is its length, its type, its data and a CRC of the type and data.
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    # Each row of the image data starts with a filter type byte, 0 meaning unfiltered.
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 3)
+    with open(filename, "wb") as image_file:
+        image_file.write(b"\x89PNG\r\n\x1a\n")
+        image_file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))  # 8-bit RGB.
+        image_file.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)))
+        image_file.write(chunk(b"IEND", b""))
+
+def _stamp_disks(canvas, xs, ys, diameter, rgb, batch_pixels=1 << 22):
+    """
+    Paints a filled disk of the given diameter at every pixel position.
+
+    The disk is a fixed set of pixel offsets, added to all positions at once;
+    the positions are processed in batches so that at most `batch_pixels`
+    pixel indices exist at a time.
+    """
+    radius = max(diameter, 1) / 2
+    reach = int(np.ceil(radius))
+    offset_y, offset_x = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+    inside = offset_x ** 2 + offset_y ** 2 <= radius ** 2
+    offset_x, offset_y = offset_x[inside], offset_y[inside]
+    height, width = canvas.shape[:2]
+    xs, ys = np.rint(xs).astype(np.int64), np.rint(ys).astype(np.int64)
+    batch = max(1, batch_pixels // len(offset_x))
+    for first in range(0, len(xs), batch):
+        pixel_x = (xs[first:first + batch, None] + offset_x).ravel()
+        pixel_y = (ys[first:first + batch, None] + offset_y).ravel()
+        visible = (pixel_x >= 0) & (pixel_x < width) & (pixel_y >= 0) & (pixel_y < height)
+        canvas[pixel_y[visible], pixel_x[visible]] = rgb
+
+def _sample_segments(x0, y0, x1, y1, spacing):
+    """Returns points along every segment, no further than `spacing` pixels apart."""
+    counts = np.ceil(np.hypot(x1 - x0, y1 - y0) / spacing).astype(np.int64) + 1
+    segment = np.repeat(np.arange(len(counts)), counts)
+    # The position of every point along its own segment, from 0 at the start to 1 at the end.
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    fraction = step / np.maximum(counts - 1, 1)[segment]
+    return (x0[segment] + fraction * (x1 - x0)[segment], y0[segment] + fraction * (y1 - y0)[segment])
+
+def render_tree_png(filename, trunk_length, left_turn, right_turn, levels, shrink_factor,
+                    size=(700, 550), fit=False, geometry=None, batch_size=1 << 18):
+    """
+    Draws a fractal tree into a PNG image without turtle or a display.
+
+    The branches are drawn a whole level at a time, so the colour and pen
+    width change once per level instead of once per branch, and the leaves
+    are drawn on top at the end. Branches keep the pixel widths turtle
+    would give them.
+
+    Args:
+        filename (str): The PNG file to write.
+        trunk_length, left_turn, right_turn, levels, shrink_factor: As for `build_tree`.
+        size (tuple): The `(width, height)` of the image in pixels.
+        fit (bool): Whether to scale the tree to fill the image, rather than
+                    placing it as in the 700x550 turtle window of `initiate_tree`.
+        geometry (dict): The tree's `compute_tree_geometry` result, if already computed.
+        batch_size (int): How many branches to rasterize at once, which bounds memory use.
+    """
+    width, height = size
+    tree = (trunk_length, left_turn, right_turn, levels, shrink_factor)
+    bounds = tree_bounds(*tree, geometry=geometry) if fit else None
+    scale, offset_x, offset_y = canvas_transform(size, bounds)
+    canvas = np.full((height, width, 3), 255, dtype=np.uint8)  # Start from a white background.
+    leaves = np.array([complex(*START_POSITION)])
+    tree_levels = iter_tree_levels(*tree) if geometry is None else iter_geometry_levels(geometry)
+    for remaining, starts, ends in tree_levels:
+        diameter = branch_thickness(remaining)
+        rgb = rgb_bytes(branch_color(remaining))
+        for first in range(0, len(starts), batch_size):
+            x0 = offset_x + scale * starts.real[first:first + batch_size]
+            y0 = offset_y - scale * starts.imag[first:first + batch_size]
+            x1 = offset_x + scale * ends.real[first:first + batch_size]
+            y1 = offset_y - scale * ends.imag[first:first + batch_size]
+            # Overlapping disks along each branch give a solid line with round ends.
+            xs, ys = _sample_segments(x0, y0, x1, y1, spacing=max(0.5, diameter / 4))
+            _stamp_disks(canvas, xs, ys, diameter, rgb)
+        if remaining == 1:
+            leaves = ends
+    leaf_size = trunk_length * shrink_factor ** levels * 0.6
+    _stamp_disks(canvas, offset_x + scale * leaves.real, offset_y - scale * leaves.imag, leaf_size, LEAF_RGB)
+    write_png(filename, canvas)
+
+def write_tree_svg(filename, trunk_length, left_turn, right_turn, levels, shrink_factor,
+                   size=(700, 550), fit=False, geometry=None, batch_size=1 << 16):
+    """
+    Streams a fractal tree to an SVG file, one level at a time.
+
+    Every level becomes a single `<path>` carrying the level's colour and
+    pen width, and the leaves one more path of round dots, so the file is
+    written as the levels are computed and the whole tree is never held in
+    memory.
+
+    Args:
+        filename (str): The SVG file to write.
+        trunk_length, left_turn, right_turn, levels, shrink_factor: As for `build_tree`.
+        size (tuple): The `(width, height)` of the drawing in pixels.
+        fit (bool): Whether to scale the tree to fill the drawing, rather than
+                    placing it as in the 700x550 turtle window of `initiate_tree`.
+        geometry (dict): The tree's `compute_tree_geometry` result, if already computed.
+        batch_size (int): How many branches to format and write at once.
+    """
+    width, height = size
+    tree = (trunk_length, left_turn, right_turn, levels, shrink_factor)
+    bounds = tree_bounds(*tree, geometry=geometry) if fit else None
+    scale, offset_x, offset_y = canvas_transform(size, bounds)
+
+    def write_points(svg_file, commands, points_by_column):
+        # Format the pixel coordinates with two decimals, a batch of path commands at a time.
+        for first in range(0, len(points_by_column[0]), batch_size):
+            columns = [column[first:first + batch_size] for column in points_by_column]
+            svg_file.write("".join(commands % tuple(row) for row in np.round(np.column_stack(columns), 2).tolist()))
+
+    with open(filename, "w") as svg_file:
+        svg_file.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                       f'viewBox="0 0 {width} {height}">\n<rect width="100%" height="100%" fill="white"/>\n')
+        leaves = np.array([complex(*START_POSITION)])
+        tree_levels = iter_tree_levels(*tree) if geometry is None else iter_geometry_levels(geometry)
+        for remaining, starts, ends in tree_levels:
+            red, green, blue = rgb_bytes(branch_color(remaining))
+            svg_file.write(f'<path fill="none" stroke="rgb({red},{green},{blue})" '
+                           f'stroke-width="{max(branch_thickness(remaining), 1)}" stroke-linecap="round" d="')
+            write_points(svg_file, "M%g %gL%g %g", (offset_x + scale * starts.real, offset_y - scale * starts.imag,
+                                                    offset_x + scale * ends.real, offset_y - scale * ends.imag))
+            svg_file.write('"/>\n')
+            if remaining == 1:
+                leaves = ends
+        # A zero-length line with round caps is a dot as wide as the stroke.
+        leaf_size = trunk_length * shrink_factor ** levels * 0.6
+        svg_file.write(f'<path fill="none" stroke="rgb({LEAF_RGB[0]},{LEAF_RGB[1]},{LEAF_RGB[2]})" stroke-width="{max(leaf_size, 1):g}" '
+                       f'stroke-linecap="round" d="')
+        write_points(svg_file, "M%g %gh0", (offset_x + scale * leaves.real, offset_y - scale * leaves.imag))
+        svg_file.write('"/>\n</svg>\n')
+
+def write_tree_npz(filename, trunk_length, left_turn, right_turn, levels, shrink_factor,
+                   size=None, fit=False, geometry=None):
+    """
+    Saves the geometry of a fractal tree to a NumPy `.npz` file.
 
+    The file holds the arrays returned by `compute_tree_geometry`. `size` and
+    `fit` only affect images and are accepted so that all output formats
+    can be written the same way.
+    """
+    if geometry is None:
+        geometry = compute_tree_geometry(trunk_length, left_turn, right_turn, levels, shrink_factor)
+    np.savez(filename, **geometry)
+
+def preview_tree(trunk_length, left_turn, right_turn, levels, shrink_factor):
+    """
+    Draws a tree in a turtle window, exactly as `initiate_tree` does.
+    Needs a display, and is best kept to small depths.
+    """
+    if turtle is None:
+        raise RuntimeError("The turtle preview needs tkinter, which is not installed.")
+    try:
         screen = turtle.Screen()  # Create the main window for the turtle graphics.
         screen.setup(width=700, height=550)  # Set the dimensions of the drawing window.
         screen.title("My Own Recursive Tree")  # Set the title of the turtle graphics window.
@@ -78,7 +567,7 @@ def initiate_tree():
         artist.goto(0, -200)  # Move the turtle to the starting position at the bottom center.
         artist.pendown()  # Put the pen down so that the turtle starts drawing.
 
-        build_tree(artist, initial_length, angle_left, angle_right, depth_level, reduction)
+        build_tree(artist, trunk_length, left_turn, right_turn, levels, shrink_factor)
         # Call the main recursive function to start drawing the tree.
 
         screen.mainloop()  # Keep the turtle graphics window open until it is manually closed.
@@ -91,8 +580,186 @@ def initiate_tree():
         except turtle.Terminator:
             pass  # Ignore if the screen is already closed.
 
+def initiate_tree():
+    """
+    Gets user input and draws the tree in a turtle window.
+    This function handles the user interaction.
+    """
+    angle_left = float(input("Specify the left branch angle (e.g., 20): "))  # Enter the angle (in degrees) for the left branches (e.g., 20).
+    angle_right = float(input("Indicate the right branch angle (e.g.,25): "))  # Enter the angle (in degrees) for the right branches (e.g., 25).
+    initial_length = float(input("Set the starting branch length (e.g.,100): "))  # Enter the length of the initial trunk (e.g., 100).
+    depth_level = int(input("Determine the recursion depth (e.g.,5): "))  # Enter the number of branching levels (e.g., 5).
+    reduction = float(input("Define the branch length reduction factor (e.g., 0.65): "))
+    # Enter a value between 0 and 1 to reduce branch length at each level (e.g., 0.7).
+
+    preview_tree(initial_length, angle_left, angle_right, depth_level, reduction)
+
+# The renderer used for each output file extension.
+RENDERERS = {'.png': render_tree_png, '.svg': write_tree_svg, '.npz': write_tree_npz}
+
+# The subtree cache of a sweep worker process, created by `_start_sweep_worker`.
+_sweep_cache = None
+
+def _start_sweep_worker(cache_bytes):
+    """Gives a sweep worker process its own subtree cache."""
+    global _sweep_cache
+    _sweep_cache = SubtreeCache(cache_bytes)
+
+def _parameter_label(value):
+    """
+    Formats a tree parameter for a file name, exactly: distinct values always give
+    distinct labels, and whole numbers drop their '.0' (20.0 gives '20').
+    """
+    label = repr(value)
+    return label[:-2] if label.endswith('.0') else label
+
+def _sweep_tree(task):
+    """
+    Renders one tree of a sweep and writes its file.
+
+    Returns:
+        dict: The manifest record of the tree.
+    """
+    left_turn, right_turn, shrink_factor, trunk_length, levels, directory, extension, size, fit = task
+    start = time.perf_counter()
+    hits = _sweep_cache.hits
+    geometry = cached_tree_geometry(_sweep_cache, trunk_length, left_turn, right_turn, levels, shrink_factor)
+    labels = map(_parameter_label, (left_turn, right_turn, shrink_factor, trunk_length))
+    filename = os.path.join(directory, "tree_l{}_r{}_s{}_t{}_d{}{}".format(*labels, levels, extension))
+    RENDERERS[extension](filename, trunk_length, left_turn, right_turn, levels, shrink_factor,
+                         size=size, fit=fit, geometry=geometry)
+    return {'file': filename, 'left_turn': left_turn, 'right_turn': right_turn,
+            'trunk_length': trunk_length, 'levels': levels, 'shrink_factor': shrink_factor,
+            'branches': len(geometry['segments']), 'cached': _sweep_cache.hits > hits,
+            'seconds': time.perf_counter() - start}
+
+def sweep_trees(directory, left_turns, right_turns, trunk_lengths, depths, shrink_factors, extension='.png',
+                size=(700, 550), fit=False, workers=None, cache_bytes=SUBTREE_CACHE_BYTES):
+    """
+    Renders a tree for every combination of the given parameters, using a pool of worker processes.
+
+    Trees that share `left_turn`, `right_turn` and `shrink_factor` are
+    copies of the same canonical tree, which every worker keeps in its own
+    `SubtreeCache` and places for each trunk length and depth it is given.
+    Rendering costs far more than building a canonical tree, so each tree is
+    a task of its own and the trees of one shape are spread over all the
+    workers; they are queued shape by shape, deepest first, so a worker
+    usually finds a deep enough canonical tree already cached. Each file is
+    written by the worker as soon as it is rendered, and the main process
+    appends its record to `sweep_manifest.jsonl` in the directory as soon as
+    it arrives. Repeated parameter values are rendered once, and every file
+    is named after the exact parameter values.
+
+    Args:
+        directory (str): The directory the trees and the manifest are written to.
+        left_turns, right_turns, trunk_lengths, depths, shrink_factors (list): The values to combine.
+        extension (str): The output format, '.png', '.svg' or '.npz'.
+        size (tuple): The `(width, height)` of the images in pixels.
+        fit (bool): Whether to scale each tree to fill its image.
+        workers (int): The number of processes, defaulting to the CPU count.
+                       With a single worker everything runs in this process.
+        cache_bytes (int): The memory budget of each worker's subtree cache.
+
+    Returns:
+        list: The manifest records of all the trees, in the order they finished.
+    """
+    os.makedirs(directory, exist_ok=True)
+    # Repeated values would render the same tree twice into the same file.
+    left_turns, right_turns, trunk_lengths, depths, shrink_factors = (
+        list(dict.fromkeys(values)) for values in (left_turns, right_turns, trunk_lengths, depths, shrink_factors))
+    variants = sorted(product(trunk_lengths, depths), key=itemgetter(1), reverse=True)
+    tasks = [(*shape, trunk_length, levels, directory, extension, tuple(size), fit)
+             for shape in product(left_turns, right_turns, shrink_factors)
+             for trunk_length, levels in variants]
+    records = []
+    with open(os.path.join(directory, SWEEP_MANIFEST_FILENAME), "w") as manifest:
+        with (Pool(workers, _start_sweep_worker, (cache_bytes,)) if workers != 1 else nullcontext()) as pool:
+            if pool is None:
+                _start_sweep_worker(cache_bytes)
+                finished_trees = map(_sweep_tree, tasks)
+            else:
+                finished_trees = pool.imap_unordered(_sweep_tree, tasks)
+            for record in finished_trees:
+                manifest.write(json.dumps(record) + "\n")
+                manifest.flush()  # Keep the manifest up to date with the files on disk.
+                records.append(record)
+    return records
+
+def parse_arguments(argv=None):
+    """
+    Parses the command line options of the headless renderer.
+
+    Each of the five tree parameters takes one value, or several with
+    `--sweep`, which renders every combination of them.
+
+    Returns:
+        argparse.Namespace: The tree parameters as lists, the output files or
+                            sweep settings, the image size and flags.
+    """
+    parser = argparse.ArgumentParser(
+        description="Render fractal trees to PNG, SVG or NPZ without a display. "
+                    "Run without any arguments to enter the parameters interactively and draw with turtle.")
+    parser.add_argument("-l", "--left", type=float, nargs="+", default=[20.0], help="left branch angle in degrees")
+    parser.add_argument("-r", "--right", type=float, nargs="+", default=[25.0], help="right branch angle in degrees")
+    parser.add_argument("-t", "--length", type=float, nargs="+", default=[100.0], help="starting branch length")
+    parser.add_argument("-d", "--depth", type=int, nargs="+", default=[5],
+                        help="recursion depth (number of branching levels)")
+    parser.add_argument("-s", "--shrink", type=float, nargs="+", default=[0.65], help="branch length reduction factor")
+    parser.add_argument("-o", "--output", nargs="+", default=["tree.png"],
+                        help="files to write; the format follows the extension (.png, .svg or .npz)")
+    parser.add_argument("--sweep", metavar="DIRECTORY",
+                        help="render every combination of the given parameter values into DIRECTORY")
+    parser.add_argument("--format", choices=["png", "svg", "npz"], default="png", help="file format of a sweep")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes for a sweep (default: CPU count)")
+    parser.add_argument("--cache-mb", type=float, default=SUBTREE_CACHE_BYTES / 2 ** 20,
+                        help="subtree cache size of each sweep worker in MB")
+    parser.add_argument("--size", type=int, nargs=2, default=(700, 550), metavar=("WIDTH", "HEIGHT"),
+                        help="image size in pixels")
+    parser.add_argument("--fit", action="store_true", help="scale the tree to fill the image")
+    parser.add_argument("--preview", action="store_true", help="also draw the tree in a turtle window")
+    options = parser.parse_args(argv)
+    if min(options.depth) < 0:
+        parser.error("--depth cannot be negative")
+    for filename in options.output:
+        if os.path.splitext(filename)[1].lower() not in RENDERERS:
+            parser.error(f"unsupported output format: {filename} (use .png, .svg or .npz)")
+    if options.sweep is None:
+        if any(len(values) > 1 for values in (options.left, options.right, options.length,
+                                              options.depth, options.shrink)):
+            parser.error("several parameter values need --sweep DIRECTORY")
+    elif options.preview:
+        parser.error("--preview cannot be combined with --sweep")
+    if options.workers is not None and options.workers < 1:
+        parser.error("--workers must be at least 1")
+    return options
+
+def main(argv=None):
+    """Renders the trees described on the command line, or asks for one interactively when there are none."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        initiate_tree()  # Without arguments, behave as the original interactive program.
+        return
+    options = parse_arguments(argv)
+    if options.sweep is not None:
+        start = time.perf_counter()
+        records = sweep_trees(options.sweep, options.left, options.right, options.length, options.depth,
+                              options.shrink, "." + options.format, tuple(options.size), options.fit,
+                              options.workers, int(options.cache_mb * 2 ** 20))
+        reused = sum(record['cached'] for record in records)
+        print(f"{len(records)} trees saved to {options.sweep} in {time.perf_counter() - start:.2f} s "
+              f"({reused} built from cached subtrees).")
+        return
+    tree = (options.length[0], options.left[0], options.right[0], options.depth[0], options.shrink[0])
+    for filename in options.output:
+        renderer = RENDERERS[os.path.splitext(filename)[1].lower()]
+        renderer(filename, *tree, size=tuple(options.size), fit=options.fit)
+        print(f"Tree saved to {filename}.")
+    if options.preview:
+        preview_tree(*tree)
+
 if __name__ == "__main__":
-    initiate_tree()  # Call the function to start the tree drawing process when the script is run.
+    main()  # Call the function to start the tree drawing process when the script is run.
 
 
 # In[ ]:
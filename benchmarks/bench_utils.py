@@ -0,0 +1,159 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+The question scripts have spaces in their file names, so they cannot be
+imported with a plain `import` statement. `load_question` loads them by path
+instead, which also keeps their `__main__` blocks from running.
+"""
+
+import importlib.util
+import os
+import random
+import string
+import sys
+import time
+
+# The repository root, one level above this benchmarks directory.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_question(number):
+    """
+    Imports one of the "HIT137 Question N.py" scripts as a module.
+
+    Args:
+        number (int): The question number (1, 2 or 3).
+
+    Returns:
+        module: The loaded script, registered in `sys.modules` so that its
+                functions can be pickled for process pools.
+    """
+    path = os.path.join(REPO_ROOT, f"HIT137 Question {number}.py")
+    module_name = f"hit137_question_{number}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_time(function, *args, repeat=3):
+    """
+    Runs a function several times and keeps the fastest wall-clock time.
+
+    Args:
+        function (callable): The function to time.
+        *args: Positional arguments passed to the function on every run.
+        repeat (int): How many times to run the function.
+
+    Returns:
+        tuple: `(seconds, result)` for the fastest run.
+    """
+    best_seconds, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+    return best_seconds, result
+
+
+def random_text(size, unicode=False, seed=137):
+    """
+    Builds a reproducible pseudo-random text of the requested length.
+
+    Args:
+        size (int): Number of characters to generate.
+        unicode (bool): Whether to sprinkle in non-ASCII characters, which
+                        take the slower general path of `str.translate`.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: Letters, digits, punctuation and whitespace.
+    """
+    alphabet = string.ascii_letters * 4 + string.digits + string.punctuation + " \n" * 8
+    if unicode:
+        alphabet += "éü°"
+    generator = random.Random(seed)
+    return "".join(generator.choices(alphabet, k=size))
+
+
+def write_text_corpus(path, size, unicode=False, seed=137):
+    """
+    Writes a reproducible random text file for the cipher benchmarks.
+
+    The text is generated one megabyte at a time, so corpora larger than
+    memory can be written.
+
+    Args:
+        path (str): The file to create.
+        size (int): Number of characters to write.
+        unicode (bool): Whether to include non-ASCII characters.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        str: The path of the file that was written.
+    """
+    block_size = 1_000_000
+    with open(path, "w", encoding="utf-8", newline="") as corpus_file:
+        for block, start in enumerate(range(0, size, block_size)):
+            corpus_file.write(random_text(min(block_size, size - start), unicode, seed + block))
+    return path
+
+
+def write_temperature_archive(directory, stations, years, missing_rate=0.0, first_year=1986, seed=137,
+                              duplicate_rate=0.0):
+    """
+    Writes a synthetic archive of `stations_group_YYYY.csv` files.
+
+    The files use the same columns as the bundled data. Each station gets a
+    base temperature and a seasonal swing, plus random noise per reading.
+
+    Args:
+        directory (str): The directory to create the files in.
+        stations (int): The number of stations in every file.
+        years (int): The number of yearly files to write.
+        missing_rate (float): The probability that any single reading is left empty.
+        first_year (int): The year of the first file.
+        seed (int): Seed for the random generator, so archives are reproducible.
+        duplicate_rate (float): The probability that a station is listed a second
+                                time in a file, with readings of its own.
+
+    Returns:
+        list: The paths of the files that were written.
+    """
+    import numpy as np
+
+    month_names = ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"]
+    generator = np.random.default_rng(seed)
+    base = generator.uniform(10.0, 35.0, stations)
+    swing = generator.uniform(2.0, 12.0, stations)
+    latitudes = generator.uniform(-43.0, -10.0, stations)
+    longitudes = generator.uniform(113.0, 154.0, stations)
+    seasonal_shape = np.cos(np.arange(12) * np.pi / 6)
+    prefixes = [f"STATION-{index:06d},{100000 + index},{latitudes[index]:.2f},{longitudes[index]:.2f}"
+                for index in range(stations)]
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for year in range(first_year, first_year + years):
+        readings = (base[:, None] + swing[:, None] * seasonal_shape
+                    + generator.normal(0.0, 1.5, (stations, 12)))
+        missing = generator.random((stations, 12)) < missing_rate
+        lines = ["STATION_NAME,STN_ID,LAT,LON," + ",".join(month_names)]
+        rows = list(zip(prefixes, readings.tolist(), missing.tolist()))
+        if duplicate_rate:
+            # Repeat some stations at the end of the file, with shifted readings.
+            repeated = np.flatnonzero(generator.random(stations) < duplicate_rate)
+            rows += [(prefixes[index], (readings[index] + 5.0).tolist(), missing[index].tolist())
+                     for index in repeated]
+        for prefix, row, row_missing in rows:
+            cells = ["" if absent else f"{value:.2f}" for value, absent in zip(row, row_missing)]
+            lines.append(prefix + "," + ",".join(cells))
+        path = os.path.join(directory, f"stations_group_{year}.csv")
+        with open(path, "w", newline="") as csv_file:
+            csv_file.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
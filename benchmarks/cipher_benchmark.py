@@ -0,0 +1,116 @@
+"""
+Throughput benchmark for the Question 1 cipher.
+
+Compares the original character-by-character `scramble_text` and
+`un_scramble_text` loops with the table-driven engine, reports MB/s for
+both and checks that they produce identical output.
+
+A second table measures many short messages encoded with a small rotating
+set of key pairs, which is where the cached translation tables pay off.
+
+Usage:
+    python benchmarks/cipher_benchmark.py [--size-mb 4] [--repeat 3] [--messages 100000]
+"""
+
+import argparse
+
+from bench_utils import best_time, load_question, random_text
+
+
+def legacy_scramble_text(plain_text, key_n, key_m):
+    """The original per-character encoder, kept as the speed and output baseline."""
+    cipher_text = ""
+    for symbol in plain_text:
+        if 'a' <= symbol <= 'z':
+            if symbol <= 'm':
+                shifted_val = (ord(symbol) - ord('a') + key_n * key_m) % 26
+                cipher_text += chr(shifted_val + ord('a'))
+            else:
+                shifted_val = (ord(symbol) - ord('a') - (key_n + key_m)) % 26
+                cipher_text += chr(shifted_val + ord('a'))
+        elif 'A' <= symbol <= 'Z':
+            if symbol <= 'M':
+                shifted_val = (ord(symbol) - ord('A') - key_n) % 26
+                cipher_text += chr(shifted_val + ord('A'))
+            else:
+                shifted_val = (ord(symbol) - ord('A') + key_m**2) % 26
+                cipher_text += chr(shifted_val + ord('A'))
+        else:
+            cipher_text += symbol
+    return cipher_text
+
+
+def legacy_un_scramble_text(encoded_text, key_n, key_m):
+    """The original per-character decoder, kept as the speed and output baseline."""
+    original_text = ""
+    for symbol in encoded_text:
+        if 'a' <= symbol <= 'z':
+            if symbol <= 'm':
+                shifted_val = (ord(symbol) - ord('a') - key_n * key_m) % 26
+                original_text += chr(shifted_val + ord('a'))
+            else:
+                shifted_val = (ord(symbol) - ord('a') + (key_n + key_m)) % 26
+                original_text += chr(shifted_val + ord('a'))
+        elif 'A' <= symbol <= 'Z':
+            if symbol <= 'M':
+                shifted_val = (ord(symbol) - ord('A') + key_n) % 26
+                original_text += chr(shifted_val + ord('A'))
+            else:
+                shifted_val = (ord(symbol) - ord('A') - key_m**2) % 26
+                original_text += chr(shifted_val + ord('A'))
+        else:
+            original_text += symbol
+    return original_text
+
+
+def encode_messages(scramble, messages, key_pairs):
+    """Encodes every message with the key pairs used in rotation."""
+    return [scramble(message, *key_pairs[index % len(key_pairs)])
+            for index, message in enumerate(messages)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Question 1 cipher.")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="size of the synthetic text in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--messages", type=int, default=100_000, help="number of short messages")
+    parser.add_argument("--unicode", action="store_true", help="include non-ASCII characters")
+    parser.add_argument("--keys", type=int, nargs=2, default=(7, 11), metavar=("N", "M"))
+    args = parser.parse_args()
+
+    question_1 = load_question(1)
+    key_n, key_m = args.keys
+    text = random_text(int(args.size_mb * 1_000_000), args.unicode)
+    megabytes = len(text.encode("utf-8")) / 1_000_000
+
+    cases = [
+        ("scramble_text", legacy_scramble_text, question_1.scramble_text, text),
+        ("un_scramble_text", legacy_un_scramble_text, question_1.un_scramble_text,
+         question_1.scramble_text(text, key_n, key_m)),
+    ]
+    print(f"{'function':<18}{'before MB/s':>14}{'after MB/s':>14}{'speed-up':>10}  output")
+    for name, before, after, source in cases:
+        before_seconds, before_result = best_time(before, source, key_n, key_m, repeat=args.repeat)
+        after_seconds, after_result = best_time(after, source, key_n, key_m, repeat=args.repeat)
+        status = "identical" if before_result == after_result else "MISMATCH"
+        print(f"{name:<18}{megabytes / before_seconds:>14.1f}{megabytes / after_seconds:>14.1f}"
+              f"{before_seconds / after_seconds:>9.1f}x  {status}")
+
+    starts = (64 * index % (len(text) - 64) for index in range(args.messages))
+    messages = [text[start:start + 64] for start in starts]
+    key_pairs = [(key_n + shift, key_m - 3 * shift) for shift in range(8)]
+    question_1.clear_table_cache()
+    before_seconds, before_result = best_time(encode_messages, legacy_scramble_text, messages, key_pairs,
+                                              repeat=args.repeat)
+    after_seconds, after_result = best_time(encode_messages, question_1.scramble_text, messages, key_pairs,
+                                            repeat=args.repeat)
+    status = "identical" if before_result == after_result else "MISMATCH"
+    print()
+    print(f"{'short messages':<18}{'before msg/s':>14}{'after msg/s':>14}{'speed-up':>10}  output")
+    print(f"{f'{len(messages)} x 64 chars':<18}{len(messages) / before_seconds:>14.0f}"
+          f"{len(messages) / after_seconds:>14.0f}{before_seconds / after_seconds:>9.1f}x  {status}")
+    print(f"table cache: {question_1.table_cache_info()['text']}")
+
+
+if __name__ == "__main__":
+    main()
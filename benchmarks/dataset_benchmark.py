@@ -0,0 +1,132 @@
+"""
+Query benchmark for the indexed `TemperatureDataset` of Question 2.
+
+Builds the dataset from a synthetic archive, both from the CSV files and
+from the memory-mapped binary store, then answers random station-mean,
+top-k season and bounding-box queries with the indexes and by brute force
+over every reading. Reports the time per query of each and checks that the
+answers agree, and that `readings` returns the values exactly as written to
+the CSV files.
+
+Usage:
+    python benchmarks/dataset_benchmark.py [--stations 500] [--years 60] [--queries 200]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from bench_utils import load_question, write_temperature_archive
+
+
+def brute_station_mean(archive, column, first_year, last_year):
+    """The mean of a station's yearly averages over a range of years, from every reading."""
+    in_range = (archive['years'] >= first_year) & (archive['years'] <= last_year)
+    rows = archive['temperatures'][in_range, column]
+    yearly = [np.nanmean(row) for row in rows if not np.all(np.isnan(row))]
+    return sum(yearly) / len(yearly) if yearly else None
+
+
+def brute_top_stations(archive, months, k, coolest, first_year, last_year):
+    """The k warmest (or coolest) stations in a season over a range of years, from every reading."""
+    in_range = (archive['years'] >= first_year) & (archive['years'] <= last_year)
+    readings = archive['temperatures'][in_range][:, :, months]
+    counts = (~np.isnan(readings)).sum(axis=(0, 2))
+    with_data = np.flatnonzero(counts > 0)
+    means = np.nansum(readings, axis=(0, 2))[with_data] / counts[with_data]
+    best = np.argsort(means if coolest else -means, kind='stable')[:k]
+    return [(archive['station_names'][with_data[i]], means[i]) for i in best]
+
+
+def brute_box(archive, min_latitude, max_latitude, min_longitude, max_longitude):
+    """The stations inside a bounding box, from every station's coordinates."""
+    latitudes, longitudes = archive['latitudes'].astype(float), archive['longitudes'].astype(float)
+    inside = ((latitudes >= min_latitude) & (latitudes <= max_latitude)
+              & (longitudes >= min_longitude) & (longitudes <= max_longitude))
+    return [archive['station_names'][column] for column in np.flatnonzero(inside)]
+
+
+def same_ranking(indexed, brute):
+    """Whether two rankings name the same stations with the same means."""
+    return ([name for name, _ in indexed] == [name for name, _ in brute]
+            and np.allclose([mean for _, mean in indexed], [mean for _, mean in brute], rtol=0, atol=1e-9))
+
+
+def check_dataset(question_2, label, dataset, archive, queries, generator):
+    """Times indexed and brute-force answers to random queries and prints whether they agree."""
+    years = archive['years']
+    station_count = len(archive['station_names'])
+    season_names = list(question_2.SEASONS)
+    cases = []
+    for _ in range(queries):
+        first_year, last_year = sorted(generator.integers(years.min(), years.max() + 1, 2).tolist())
+        season = season_names[generator.integers(len(season_names))]
+        latitude, longitude = generator.uniform(-43.0, -15.0), generator.uniform(113.0, 150.0)
+        cases.append((int(generator.integers(station_count)), first_year, last_year, season,
+                      int(generator.integers(1, 20)), bool(generator.integers(2)),
+                      (latitude, latitude + 4.0, longitude, longitude + 4.0)))
+
+    def indexed():
+        return [(dataset.station_mean(archive['station_ids'][column], first_year, last_year),
+                 dataset.top_stations_in_season(season, k, coolest, first_year, last_year),
+                 dataset.stations_in_box(*box))
+                for column, first_year, last_year, season, k, coolest, box in cases]
+
+    def brute():
+        return [(brute_station_mean(archive, column, first_year, last_year),
+                 brute_top_stations(archive, [question_2.MONTH_NAMES.index(month)
+                                              for month in question_2.SEASONS[season]],
+                                    k, coolest, first_year, last_year),
+                 brute_box(archive, *box))
+                for column, first_year, last_year, season, k, coolest, box in cases]
+
+    start = time.perf_counter()
+    indexed_answers = indexed()
+    indexed_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    brute_answers = brute()
+    brute_seconds = time.perf_counter() - start
+
+    agree = all((mean is None and brute_mean is None or abs(mean - brute_mean) <= 1e-9)
+                and same_ranking(top, brute_top) and box == brute_box_names
+                for (mean, top, box), (brute_mean, brute_top, brute_box_names) in zip(indexed_answers, brute_answers))
+    # Every reading comes back exactly as parsed from the CSV files.
+    exact = all(np.array_equal(dataset.readings(archive['station_ids'][column], int(archive['years'][year])),
+                               archive['temperatures'][year, column], equal_nan=True)
+                for year, column in zip(generator.integers(len(years), size=50).tolist(),
+                                        generator.integers(station_count, size=50).tolist()))
+    print(f"{label:<10}{indexed_seconds / queries * 1000:>12.3f}{brute_seconds / queries * 1000:>12.3f}"
+          f"{brute_seconds / indexed_seconds:>9.1f}x  {'agree' if agree else 'MISMATCH'}, "
+          f"readings {'exact' if exact else 'CHANGED'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check TemperatureDataset queries against brute force.")
+    parser.add_argument("--stations", type=int, default=500, help="stations in the synthetic archive")
+    parser.add_argument("--years", type=int, default=60, help="yearly files in the synthetic archive")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="probability of an empty reading")
+    parser.add_argument("--queries", type=int, default=200, help="random queries of each kind")
+    args = parser.parse_args()
+
+    question_2 = load_question(2)
+    with tempfile.TemporaryDirectory() as work_directory:
+        data_directory = os.path.join(work_directory, "data")
+        store_directory = os.path.join(work_directory, "store")
+        write_temperature_archive(data_directory, args.stations, args.years, args.missing_rate)
+        archive = question_2.read_archive(data_directory)
+        question_2.convert_to_store(data_directory, store_directory)
+
+        print(f"{'dataset':<10}{'indexed ms':>12}{'brute ms':>12}{'speed-up':>10}  answers")
+        for label, build in (("CSV", lambda: question_2.TemperatureDataset.from_csv(data_directory)),
+                             ("store", lambda: question_2.TemperatureDataset.from_store(store_directory))):
+            dataset = build()
+            check_dataset(question_2, label, dataset, archive, args.queries, np.random.default_rng(137))
+        store_dataset = question_2.TemperatureDataset.from_store(store_directory)
+        print(f"store left memory-mapped: {isinstance(store_dataset.temperatures, np.memmap)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Ingestion benchmark for `load_temperature_data` in Question 2.
+
+Generates a synthetic archive of many small `stations_group_*.csv` files and
+compares the bulk split-based loader with the previous `csv.DictReader`
+loader, checking that both produce the same station list and array.
+
+Usage:
+    python benchmarks/ingest_benchmark.py [--files 10000] [--stations 50] [--missing-rate 0.05]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from bench_utils import load_question, write_temperature_archive
+
+
+def dictreader_load_temperature_data(data_directory, month_names):
+    """The previous `csv.DictReader` loader, kept as the speed and output baseline."""
+    station_index = {}
+    file_rows = []
+    for filename in sorted(os.listdir(data_directory)):
+        filepath = os.path.join(data_directory, filename)
+        if os.path.isfile(filepath) and filename.endswith('.csv'):
+            with open(filepath, 'r', newline='') as csvfile:
+                reader = csv.DictReader(csvfile)
+                if month_names[0] not in reader.fieldnames or 'STATION_NAME' not in reader.fieldnames:
+                    continue
+                rows = []
+                for row in reader:
+                    station = station_index.setdefault(row['STATION_NAME'], len(station_index))
+                    rows.append((station, [float(row[month]) if row[month] else np.nan for month in month_names]))
+                file_rows.append(rows)
+    temperatures = np.full((len(file_rows), len(station_index), len(month_names)), np.nan)
+    for year, rows in enumerate(file_rows):
+        for station, monthly_temps in rows:
+            temperatures[year, station] = monthly_temps
+    return list(station_index), temperatures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV ingestion for Question 2.")
+    parser.add_argument("--files", type=int, default=10_000, help="number of yearly files")
+    parser.add_argument("--stations", type=int, default=50, help="stations per file")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="probability of an empty reading")
+    args = parser.parse_args()
+
+    question_2 = load_question(2)
+    with tempfile.TemporaryDirectory() as data_directory:
+        write_temperature_archive(data_directory, args.stations, args.files, args.missing_rate)
+        rows = args.files * args.stations
+
+        start = time.perf_counter()
+        before = dictreader_load_temperature_data(data_directory, question_2.MONTH_NAMES)
+        before_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        after = question_2.load_temperature_data(data_directory)
+        after_seconds = time.perf_counter() - start
+
+    identical = before[0] == after[0] and np.array_equal(before[1], after[1], equal_nan=True)
+    print(f"{args.files} files x {args.stations} stations ({rows} rows)")
+    print(f"{'loader':<14}{'seconds':>10}{'rows/s':>12}")
+    print(f"{'DictReader':<14}{before_seconds:>10.2f}{rows / before_seconds:>12.0f}")
+    print(f"{'bulk':<14}{after_seconds:>10.2f}{rows / after_seconds:>12.0f}")
+    print(f"speed-up {before_seconds / after_seconds:.1f}x, output {'identical' if identical else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
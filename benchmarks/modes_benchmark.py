@@ -0,0 +1,159 @@
+"""
+Equality and speed check of every Question 2 loading mode against the original script.
+
+The original script kept a list of rows per station and computed the reports
+with plain Python loops. `reference_reports` repeats that computation, and
+every mode of the optimized script (the dense array, the streaming pass, the
+map-reduce pool, the summary cache and the binary store) must give the same report values and
+name the same stations. Two archives are checked: a small hand-written one
+with the edge cases that have split the modes before (a station listed
+twice in one file, two ranges that are equal in double precision but not
+after a round trip through float32, and a station whose STN_ID keeps its
+readings while its name changes), and a synthetic one with repeated stations
+and missing readings.
+
+Usage:
+    python benchmarks/modes_benchmark.py [--stations 200] [--years 50] [--duplicate-rate 0.05]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from bench_utils import load_question, write_temperature_archive
+
+# Rows are (STATION_NAME, STN_ID, readings). A station listed twice in one file counts
+# as two years in the original script, D and E share the largest range (20.84) exactly
+# in double precision, and station 1 is renamed from OLD to NEW, which the original
+# script reports as two stations because it goes by name.
+EDGE_CASES = {
+    "stations_group_2000.csv": [("A", "", [10.0] * 12), ("B", "", [20.0] * 12), ("A", "", [25.0] * 12),
+                                ("OLD", "1", [0.0] * 12)],
+    "stations_group_2001.csv": [("B", "", [21.0] * 12), ("C", "", [None, 5.0] + [None] * 10),
+                                ("D", "", [25.84, 5.0] + [None] * 10), ("E", "", [26.97, 6.13] + [None] * 10),
+                                ("NEW", "1", [40.0] * 12)],
+}
+
+
+def write_edge_case_archive(directory, month_names):
+    """Writes the hand-written edge-case files."""
+    os.makedirs(directory, exist_ok=True)
+    for filename, rows in EDGE_CASES.items():
+        with open(os.path.join(directory, filename), "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["STATION_NAME", "STN_ID", "LAT", "LON"] + month_names)
+            for name, station_id, readings in rows:
+                writer.writerow([name, station_id, "", ""] + ["" if value is None else value for value in readings])
+
+
+def reference_reports(data_directory, month_names, seasons):
+    """The report values as the original script computed them, rounded as they are written."""
+    station_temperatures = {}
+    for filename in sorted(os.listdir(data_directory)):
+        with open(os.path.join(data_directory, filename), newline="") as csv_file:
+            for row in csv.DictReader(csv_file):
+                station_temperatures.setdefault(row["STATION_NAME"], []).append(
+                    [float(row[month]) if row[month] else None for month in month_names])
+    rows = [year_data for data in station_temperatures.values() for year_data in data]
+    monthly = {}
+    for i, month in enumerate(month_names):
+        temps = [year_data[i] for year_data in rows if year_data[i] is not None]
+        monthly[month] = sum(temps) / len(temps) if temps else 0
+    seasonal = {}
+    for season, months in seasons.items():
+        temps = [year_data[month_names.index(month)] for year_data in rows for month in months
+                 if year_data[month_names.index(month)] is not None]
+        seasonal[season] = sum(temps) / len(temps) if temps else 0
+    ranges, averages = {}, {}
+    for station, data in station_temperatures.items():
+        all_temps = [temp for year_data in data for temp in year_data if temp is not None]
+        if all_temps:
+            ranges[station] = max(all_temps) - min(all_temps)
+        yearly = [sum(valid) / len(valid) for valid in ([t for t in year_data if t is not None] for year_data in data)
+                  if valid]
+        if yearly:
+            averages[station] = sum(yearly) / len(yearly)
+    return report_values(monthly, seasonal, ranges, averages)
+
+
+def report_values(monthly, seasonal, ranges, averages):
+    """Rounds the report statistics as the report files do and names the extreme stations."""
+    def extremes(values, pick):
+        return sorted(station for station, value in values.items() if value == pick(values.values()))
+
+    return {
+        'monthly': {month: round(value, 2) for month, value in monthly.items()},
+        'seasonal': {season: round(value, 2) for season, value in seasonal.items()},
+        'largest_range': extremes(ranges, max) if ranges else [],
+        'warmest': extremes(averages, max) if averages else [],
+        'coolest': extremes(averages, min) if averages else [],
+        'averages': {station: round(value, 2) for station, value in averages.items()},
+        'ranges': {station: round(value, 2) for station, value in ranges.items()},
+    }
+
+
+def mode_reports(question_2, summary):
+    """The report values of one mode, in the same form as `reference_reports`."""
+    statistics = question_2.summary_statistics(summary)
+    extremes = question_2.find_report_extremes(statistics)
+    values = report_values(statistics['monthly'], statistics['seasonal'], statistics['ranges'],
+                           statistics['averages'])
+    values.update({name: sorted(stations) for name, stations in extremes.items()})
+    return values
+
+
+def loading_modes(question_2, data_directory, work_directory):
+    """Returns a function per mode that summarizes the archive."""
+    cache_path = os.path.join(work_directory, "cache.sqlite")
+    store_directory = os.path.join(work_directory, "store")
+
+    def from_store():
+        question_2.convert_to_store(data_directory, store_directory)
+        return question_2.summarize_store(question_2.open_store(store_directory))
+
+    return {
+        'array': lambda: question_2.summarize_temperatures(*question_2.load_temperature_data(data_directory)),
+        'stream': lambda: question_2.accumulate_rows(question_2.iter_temperature_rows(data_directory)),
+        'map-reduce': lambda: question_2.summarize_archive(data_directory, workers=1),
+        'cache': lambda: question_2.summarize_archive_incremental(data_directory, cache_path, rebuild=True)[0],
+        'store': from_store,
+    }
+
+
+def check_archive(question_2, label, data_directory, work_directory):
+    """Times every mode on one archive and prints whether it matches the original script."""
+    reference = reference_reports(data_directory, question_2.MONTH_NAMES, question_2.SEASONS)
+    for mode, summarize in loading_modes(question_2, data_directory, work_directory).items():
+        start = time.perf_counter()
+        summary = summarize()
+        seconds = time.perf_counter() - start
+        differences = [key for key, value in mode_reports(question_2, summary).items() if reference[key] != value]
+        status = "identical" if not differences else "MISMATCH in " + ", ".join(differences)
+        print(f"{label:<12}{mode:<12}{seconds:>10.3f}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every Question 2 loading mode against the original script.")
+    parser.add_argument("--stations", type=int, default=200, help="stations in the synthetic archive")
+    parser.add_argument("--years", type=int, default=50, help="yearly files in the synthetic archive")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="probability of an empty reading")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05,
+                        help="probability that a station is listed twice in a file")
+    args = parser.parse_args()
+
+    question_2 = load_question(2)
+    print(f"{'archive':<12}{'mode':<12}{'seconds':>10}  reports")
+    with tempfile.TemporaryDirectory() as work_directory:
+        edge_directory = os.path.join(work_directory, "edge_cases")
+        write_edge_case_archive(edge_directory, question_2.MONTH_NAMES)
+        check_archive(question_2, "edge cases", edge_directory, work_directory)
+        synthetic_directory = os.path.join(work_directory, "synthetic")
+        write_temperature_archive(synthetic_directory, args.stations, args.years, args.missing_rate,
+                                  duplicate_rate=args.duplicate_rate)
+        check_archive(question_2, "synthetic", synthetic_directory, work_directory)
+
+
+if __name__ == "__main__":
+    main()
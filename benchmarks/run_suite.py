@@ -0,0 +1,150 @@
+"""
+Reproducible benchmark suite covering all three questions.
+
+Generates the synthetic inputs, then times:
+  * `scramble_text` and `un_scramble_text` on a random text corpus (MB/s);
+  * `load_temperature_data` and the report computation on a synthetic
+    `stations_group_*.csv` archive (station-years/s);
+  * `build_tree` at increasing depths, drawn with a recording painter, and
+    `compute_tree_geometry` at the same depths (branches/s). Both give the
+    same digest when the engine draws the same tree.
+
+Every result carries a digest of its output. Saving a run with `--output` and
+passing that file to a later run with `--baseline` prints the speed ratio of
+each benchmark and whether its output is unchanged, so optimized engines can
+be checked against this baseline for both speed and output equality.
+
+Usage:
+    python benchmarks/run_suite.py [--text-mb 2] [--stations 200] [--years 50]
+                                   [--missing-rate 0.05] [--depths 8 10 12 14]
+                                   [--output results.json] [--baseline results.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import tempfile
+
+from bench_utils import best_time, load_question, write_temperature_archive, write_text_corpus
+from store_benchmark import rounded_statistics
+from tree_benchmark import geometry_rows, record_tree, tree_digest
+
+
+def text_digest(text):
+    """Returns a short SHA-256 digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def cipher_benchmarks(question_1, work_directory, megabytes, key_n, key_m, repeat):
+    """Times the Question 1 cipher in both directions on a random corpus."""
+    path = write_text_corpus(os.path.join(work_directory, "corpus.txt"), int(megabytes * 1_000_000))
+    with open(path, encoding="utf-8") as corpus_file:
+        text = corpus_file.read()
+    size = len(text.encode("utf-8")) / 1_000_000
+    encode_seconds, encoded = best_time(question_1.scramble_text, text, key_n, key_m, repeat=repeat)
+    decode_seconds, decoded = best_time(question_1.un_scramble_text, encoded, key_n, key_m, repeat=repeat)
+    return [
+        {'name': 'scramble_text', 'size': f"{size:.1f} MB", 'seconds': encode_seconds,
+         'throughput': size / encode_seconds, 'unit': 'MB/s', 'digest': text_digest(encoded)},
+        {'name': 'un_scramble_text', 'size': f"{size:.1f} MB", 'seconds': decode_seconds,
+         'throughput': size / decode_seconds, 'unit': 'MB/s', 'digest': text_digest(decoded)},
+    ]
+
+
+def temperature_benchmarks(question_2, work_directory, stations, years, missing_rate, repeat):
+    """Times loading a synthetic archive and computing the report values from it."""
+    data_directory = os.path.join(work_directory, "temperature_data")
+    write_temperature_archive(data_directory, stations, years, missing_rate)
+
+    def reports(station_names, temperatures):
+        statistics = question_2.compute_temperature_statistics(station_names, temperatures)
+        return statistics, question_2.find_report_extremes(statistics)
+
+    load_seconds, (station_names, temperatures) = best_time(question_2.load_temperature_data, data_directory,
+                                                           repeat=repeat)
+    report_seconds, (statistics, extremes) = best_time(reports, station_names, temperatures, repeat=repeat)
+    rows = stations * years
+    size = f"{stations}x{years}"
+    loaded = hashlib.sha256(temperatures.tobytes() + "\n".join(station_names).encode("utf-8")).hexdigest()[:16]
+    reported = hashlib.sha256(json.dumps([rounded_statistics(statistics), rounded_statistics(extremes)],
+                                         sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return [
+        {'name': 'load_temperature_data', 'size': size, 'seconds': load_seconds,
+         'throughput': rows / load_seconds, 'unit': 'rows/s', 'digest': loaded},
+        {'name': 'report statistics', 'size': size, 'seconds': report_seconds,
+         'throughput': rows / report_seconds, 'unit': 'rows/s', 'digest': reported},
+    ]
+
+
+def tree_benchmarks(question_3, depths, repeat):
+    """Times `build_tree` and the geometry engine at each depth with the `initiate_tree` example parameters."""
+    results = []
+    for depth in depths:
+        seconds, painter = best_time(record_tree, question_3, 100.0, 20.0, 25.0, depth, 0.65, repeat=repeat)
+        results.append({'name': f"build_tree depth {depth}", 'size': f"{len(painter.segments)} branches",
+                        'seconds': seconds, 'throughput': len(painter.segments) / seconds, 'unit': 'branches/s',
+                        'digest': tree_digest(painter.segments, painter.leaves)})
+    for depth in depths:
+        seconds, geometry = best_time(question_3.compute_tree_geometry, 100.0, 20.0, 25.0, depth, 0.65,
+                                      repeat=repeat)
+        results.append({'name': f"tree geometry depth {depth}", 'size': f"{len(geometry['segments'])} branches",
+                        'seconds': seconds, 'throughput': len(geometry['segments']) / seconds,
+                        'unit': 'branches/s', 'digest': tree_digest(*geometry_rows(question_3, geometry))})
+    return results
+
+
+def print_results(results, baseline=None):
+    """Prints one table row per benchmark, compared with the baseline run if one is given."""
+    # Only runs of the same benchmark at the same size are comparable.
+    baseline = {(result['name'], result['size']): result for result in (baseline or {}).get('results', [])}
+    header = f"{'benchmark':<24}{'size':>18}{'seconds':>10}{'throughput':>22}  {'digest':<16}"
+    print(header + ("  vs baseline" if baseline else ""))
+    for result in results:
+        line = (f"{result['name']:<24}{result['size']:>18}{result['seconds']:>10.4f}"
+                f"{result['throughput']:>11.0f} {result['unit']:<10}  {result['digest']:<16}")
+        previous = baseline.get((result['name'], result['size']))
+        if previous is not None:
+            status = "same output" if previous['digest'] == result['digest'] else "OUTPUT CHANGED"
+            line += f"  {previous['seconds'] / result['seconds']:>5.2f}x  {status}"
+        elif baseline:
+            line += "  (new)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite for all three questions.")
+    parser.add_argument("--text-mb", type=float, default=2.0, help="size of the cipher corpus in MB")
+    parser.add_argument("--keys", type=int, nargs=2, default=(7, 11), metavar=("N", "M"))
+    parser.add_argument("--stations", type=int, default=200, help="stations in the synthetic archive")
+    parser.add_argument("--years", type=int, default=50, help="yearly files in the synthetic archive")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="probability of an empty reading")
+    parser.add_argument("--depths", type=int, nargs="+", default=[8, 10, 12, 14], help="tree depths to time")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by an earlier run")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_directory:
+        results += cipher_benchmarks(load_question(1), work_directory, args.text_mb, *args.keys, args.repeat)
+        results += temperature_benchmarks(load_question(2), work_directory, args.stations, args.years,
+                                          args.missing_rate, args.repeat)
+    results += tree_benchmarks(load_question(3), args.depths, args.repeat)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'arguments': vars(args), 'results': results}, output_file, indent=2)
+            output_file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Load benchmark comparing the CSV archive with the binary store of Question 2.
+
+For the bundled 20-year data set and a synthetic archive 100 times larger,
+times the conversion to the binary store, then compares cold start to
+statistics from the CSV files with the same from the memory-mapped store,
+and checks that both give the same report values.
+
+Usage:
+    python benchmarks/store_benchmark.py [--scale 100] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from bench_utils import REPO_ROOT, best_time, load_question, write_temperature_archive
+
+
+def rounded_statistics(statistics):
+    """Rounds every statistic to the two decimals shown in the reports."""
+    return {name: {key: round(value, 2) for key, value in values.items()}
+            for name, values in statistics.items()}
+
+
+def compare_loads(question_2, label, data_directory, store_directory, repeat):
+    """Times CSV and binary-store analyses of one archive and prints a table row."""
+    def from_csv():
+        return question_2.compute_temperature_statistics(*question_2.load_temperature_data(data_directory))
+
+    def from_store():
+        return question_2.summary_statistics(question_2.summarize_store(question_2.open_store(store_directory)))
+
+    start = time.perf_counter()
+    shape = question_2.convert_to_store(data_directory, store_directory)
+    convert_seconds = time.perf_counter() - start
+    csv_bytes = sum(os.path.getsize(path) for path in question_2.find_data_files(data_directory))
+    store_bytes = sum(os.path.getsize(os.path.join(store_directory, name)) for name in os.listdir(store_directory))
+
+    csv_seconds, csv_statistics = best_time(from_csv, repeat=repeat)
+    store_seconds, store_statistics = best_time(from_store, repeat=repeat)
+    open_seconds, _ = best_time(question_2.open_store, store_directory, repeat=repeat)
+    status = "identical" if rounded_statistics(csv_statistics) == rounded_statistics(store_statistics) else "MISMATCH"
+    print(f"{label:<22}{'x'.join(map(str, shape)):>16}{csv_bytes / 1e6:>9.1f}{store_bytes / 1e6:>9.1f}"
+          f"{convert_seconds:>10.3f}{csv_seconds:>10.3f}{open_seconds * 1000:>9.2f}"
+          f"{store_seconds:>10.3f}{csv_seconds / store_seconds:>8.1f}x  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV and binary store loading for Question 2.")
+    parser.add_argument("--scale", type=int, default=100, help="size of the synthetic archive relative to the bundled one")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    question_2 = load_question(2)
+    data_directory = os.path.join(REPO_ROOT, question_2.DATA_DIRECTORY)
+    station_names, temperatures = question_2.load_temperature_data(data_directory)
+    years, stations = temperatures.shape[:2]
+
+    print(f"{'archive':<22}{'shape':>16}{'CSV MB':>9}{'bin MB':>9}{'convert s':>10}"
+          f"{'CSV s':>10}{'open ms':>9}{'binary s':>10}{'speed-up':>9}  reports")
+    with tempfile.TemporaryDirectory() as work_directory:
+        compare_loads(question_2, "bundled", data_directory,
+                      os.path.join(work_directory, "bundled_store"), args.repeat)
+        # Grow both dimensions so the synthetic archive holds `scale` times as many readings.
+        synthetic_directory = os.path.join(work_directory, "synthetic")
+        year_factor = max(1, int(args.scale ** 0.5))
+        write_temperature_archive(synthetic_directory, stations * args.scale // year_factor, years * year_factor,
+                                  missing_rate=0.02)
+        compare_loads(question_2, f"synthetic {args.scale}x", synthetic_directory,
+                      os.path.join(work_directory, "synthetic_store"), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
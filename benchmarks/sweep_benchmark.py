@@ -0,0 +1,79 @@
+"""
+Parameter-sweep benchmark for the Question 3 subtree cache.
+
+Builds the geometry of every tree in a grid of angles, trunk lengths, depths
+and shrink factors twice: from scratch with `compute_tree_geometry`, and by
+placing canonical trees from a `SubtreeCache` with `cached_tree_geometry`.
+Checks that both give the same branches and leaves, then times a full
+`sweep_trees` run writing `.npz` files with a growing number of workers.
+
+Usage:
+    python benchmarks/sweep_benchmark.py [--angles 4] [--depths 10 12 14] [--max-workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from itertools import product
+
+import numpy as np
+
+from bench_utils import load_question
+from parallel_cipher_benchmark import worker_counts
+
+
+def build_all(build, grid):
+    """Builds every tree of the grid and returns the total number of branches."""
+    return sum(len(build(*tree)['segments']) for tree in grid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tree sweeps with and without the subtree cache.")
+    parser.add_argument("--angles", type=int, default=4, help="number of left and of right angles")
+    parser.add_argument("--lengths", type=float, nargs="+", default=[80.0, 100.0, 120.0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[10, 12, 14])
+    parser.add_argument("--shrinks", type=float, nargs="+", default=[0.6, 0.7])
+    parser.add_argument("--cache-mb", type=float, default=64.0, help="subtree cache size in MB")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    question_3 = load_question(3)
+    left_turns = np.linspace(10.0, 40.0, args.angles).tolist()
+    right_turns = np.linspace(15.0, 45.0, args.angles).tolist()
+    grid = [(length, left, right, depth, shrink) for left, right, shrink, length, depth
+            in product(left_turns, right_turns, args.shrinks, args.lengths, sorted(args.depths, reverse=True))]
+    cache = question_3.SubtreeCache(int(args.cache_mb * 2 ** 20))
+
+    start = time.perf_counter()
+    branches = build_all(question_3.compute_tree_geometry, grid)
+    direct_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    build_all(lambda *tree: question_3.cached_tree_geometry(cache, *tree), grid)
+    cached_seconds = time.perf_counter() - start
+    identical = all(
+        np.allclose(question_3.compute_tree_geometry(*tree)['segments'],
+                    question_3.cached_tree_geometry(cache, *tree)['segments'], atol=1e-9)
+        for tree in grid[::max(1, len(grid) // 20)])
+
+    print(f"{len(grid)} trees, {branches} branches")
+    print(f"{'geometry':<16}{'seconds':>10}{'branches/s':>14}")
+    print(f"{'from scratch':<16}{direct_seconds:>10.3f}{branches / direct_seconds:>14.0f}")
+    print(f"{'subtree cache':<16}{cached_seconds:>10.3f}{branches / cached_seconds:>14.0f}")
+    print(f"speed-up {direct_seconds / cached_seconds:.1f}x, output {'identical' if identical else 'MISMATCH'}, "
+          f"cache {cache.info()}")
+
+    print()
+    print(f"{'workers':>8}{'sweep s':>10}{'trees/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts(args.max_workers):
+            start = time.perf_counter()
+            records = question_3.sweep_trees(directory, left_turns, right_turns, args.lengths, args.depths,
+                                             args.shrinks, '.npz', workers=workers,
+                                             cache_bytes=int(args.cache_mb * 2 ** 20))
+            seconds = time.perf_counter() - start
+            print(f"{workers:>8}{seconds:>10.3f}{len(records) / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
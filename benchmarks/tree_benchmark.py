@@ -0,0 +1,171 @@
+"""
+Depth benchmark for the Question 3 fractal tree.
+
+`build_tree` draws through a turtle, which needs a display. This benchmark
+passes it a `RecordingPainter` instead: an object with the same drawing
+methods that only tracks its position and heading and records every branch
+and leaf. That times the recursion and geometry without Tk, and the recorded
+drawing is the reference that faster engines are checked against.
+
+Each depth is also built with the level-vectorized `compute_tree_geometry`,
+which continues to depths the recursion cannot reach in reasonable time.
+
+Usage:
+    python benchmarks/tree_benchmark.py [--depths 8 10 12 14] [--engine-depths 16 18 20] [--repeat 3]
+"""
+
+import argparse
+import hashlib
+import math
+
+import numpy as np
+
+from bench_utils import best_time, load_question
+
+# The starting point and heading that `initiate_tree` gives the turtle.
+START_POSITION = (0.0, -200.0)
+START_HEADING = 90.0
+
+
+class RecordingPainter:
+    """
+    Stands in for a `turtle.Turtle` and records what it would draw.
+
+    Branches drawn by `forward` are kept as rows of
+    `(x0, y0, x1, y1, width, red, green, blue)` and leaves drawn by `dot` as
+    `(x, y, size)`. `backward` only moves back: the turtle retraces the branch
+    it has just drawn, which adds nothing to the tree's shape.
+    """
+
+    def __init__(self, position=START_POSITION, heading=START_HEADING):
+        self.x, self.y = position
+        self.heading = heading
+        self.width = 1
+        self.pen_color = (0.0, 0.0, 0.0)
+        self.calls = 0 # Every method call, i.e. every round-trip a real turtle would make.
+        self.segments = []
+        self.leaves = []
+
+    def _move(self, distance):
+        radians = math.radians(self.heading)
+        self.x += distance * math.cos(radians)
+        self.y += distance * math.sin(radians)
+
+    def forward(self, distance):
+        self.calls += 1
+        start_x, start_y = self.x, self.y
+        self._move(distance)
+        self.segments.append((start_x, start_y, self.x, self.y, self.width) + self.pen_color)
+
+    def backward(self, distance):
+        self.calls += 1
+        self._move(-distance)
+
+    def left(self, angle):
+        self.calls += 1
+        self.heading += angle
+
+    def right(self, angle):
+        self.calls += 1
+        self.heading -= angle
+
+    def pensize(self, width):
+        self.calls += 1
+        self.width = width
+
+    def color(self, color):
+        self.calls += 1
+        # Named colours are only used for the leaves, which record no colour.
+        if not isinstance(color, str):
+            self.pen_color = tuple(color)
+
+    def dot(self, size):
+        self.calls += 1
+        self.leaves.append((self.x, self.y, size))
+
+
+def record_tree(question_3, trunk_length, left_turn, right_turn, levels, shrink_factor):
+    """Runs `build_tree` with a `RecordingPainter` and returns the painter."""
+    painter = RecordingPainter()
+    question_3.build_tree(painter, trunk_length, left_turn, right_turn, levels, shrink_factor)
+    return painter
+
+
+def geometry_rows(question_3, geometry):
+    """
+    Converts the result of `compute_tree_geometry` to the rows a `RecordingPainter` records.
+
+    Returns:
+        tuple: `(segments, leaves)` with branch rows of
+               `(x0, y0, x1, y1, width, red, green, blue)` and leaf rows of `(x, y, size)`.
+    """
+    levels = geometry['levels'].astype(int)
+    # Look the style up once per level rather than once per branch.
+    styles = np.array([[question_3.branch_thickness(level), *question_3.branch_color(level)]
+                       for level in range(levels.max(initial=0) + 1)])
+    segments = np.column_stack((geometry['segments'], styles[levels]))
+    leaves = np.column_stack((geometry['leaves'], np.full(len(geometry['leaves']), geometry['leaf_size'])))
+    return segments, leaves
+
+
+def canonical_tree(segments, leaves, decimals=6):
+    """
+    Puts tree geometry in an order-independent form for comparisons.
+
+    Args:
+        segments (array-like): Branch rows of `(x0, y0, x1, y1, width, red, green, blue)`.
+        leaves (array-like): Leaf rows of `(x, y, size)`.
+        decimals (int): The rounding applied before sorting, which hides
+                        floating-point noise from different evaluation orders.
+
+    Returns:
+        tuple: `(segments, leaves)` as rounded float arrays sorted by row.
+    """
+    sorted_arrays = []
+    for rows, columns in ((segments, 8), (leaves, 3)):
+        array = np.round(np.asarray(rows, dtype=float).reshape(-1, columns), decimals) + 0.0 # + 0.0 drops -0.0.
+        sorted_arrays.append(array[np.lexsort(array.T[::-1])])
+    return tuple(sorted_arrays)
+
+
+def tree_digest(segments, leaves):
+    """Returns a short SHA-256 digest of the canonical form of a tree."""
+    digest = hashlib.sha256()
+    for array in canonical_tree(segments, leaves):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build_tree at increasing depths.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[8, 10, 12, 14], help="tree depths to time")
+    parser.add_argument("--engine-depths", type=int, nargs="*", default=[16, 18, 20],
+                        help="further depths timed with compute_tree_geometry only")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--params", type=float, nargs=4, default=(20.0, 25.0, 100.0, 0.65),
+                        metavar=("LEFT", "RIGHT", "LENGTH", "SHRINK"))
+    args = parser.parse_args()
+
+    question_3 = load_question(3)
+    left_turn, right_turn, trunk_length, shrink_factor = args.params
+    print(f"{'depth':>6}{'branches':>10}{'turtle calls':>14}{'build_tree s':>14}{'engine s':>10}"
+          f"{'engine branches/s':>19}{'speed-up':>10}  output")
+    for depth in args.depths + args.engine_depths:
+        engine_seconds, geometry = best_time(question_3.compute_tree_geometry, trunk_length, left_turn, right_turn,
+                                             depth, shrink_factor, repeat=args.repeat)
+        branches = len(geometry['segments'])
+        line = f"{depth:>6}{branches:>10}"
+        if depth in args.depths:
+            seconds, painter = best_time(record_tree, question_3, trunk_length, left_turn, right_turn, depth,
+                                         shrink_factor, repeat=args.repeat)
+            identical = tree_digest(painter.segments, painter.leaves) == tree_digest(
+                *geometry_rows(question_3, geometry))
+            line += (f"{painter.calls:>14}{seconds:>14.3f}{engine_seconds:>10.3f}{branches / engine_seconds:>19.0f}"
+                     f"{seconds / engine_seconds:>9.1f}x  {'identical' if identical else 'MISMATCH'}")
+        else:
+            line += f"{'-':>14}{'-':>14}{engine_seconds:>10.3f}{branches / engine_seconds:>19.0f}{'-':>10}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()